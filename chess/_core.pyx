@@ -0,0 +1,404 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# distutils: extra_compile_args = -O3 -march=native
+"""
+Compiled kernel of attack generation, move generation and check detection.
+
+The board keeps a Position mirroring its bitboards and updates it on every push and pop.
+
+The extension is optional, build it in place with ``cythonize -i chess/_core.pyx``.
+The board falls back to the pure Python implementation when it is not available.
+"""
+from libc.stdint cimport uint64_t
+
+from .attack_tables import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    PAWN_DOUBLE_PUSHES,
+    PAWN_PUSHES,
+)
+from .const import COLORS, PIECE_TYPES
+from .magics import (
+    BISHOP_ATTACKS,
+    BISHOP_MAGICS,
+    BISHOP_MASKS,
+    BISHOP_SHIFTS,
+    ROOK_ATTACKS,
+    ROOK_MAGICS,
+    ROOK_MASKS,
+    ROOK_SHIFTS,
+)
+
+cdef extern from *:
+    int __builtin_ctzll(unsigned long long x) nogil
+    int __builtin_popcountll(unsigned long long x) nogil
+
+cdef enum:
+    PAWN = 0
+    KNIGHT = 1
+    BISHOP = 2
+    ROOK = 3
+    QUEEN = 4
+    KING = 5
+    # sum of the attack table sizes over all squares for the standard relevant masks
+    ROOK_TABLE_SIZE = 102400
+    BISHOP_TABLE_SIZE = 5248
+
+cdef struct PositionData:
+    uint64_t pieces[2][6]
+    uint64_t occupied[2]
+    uint64_t occupied_all
+    uint64_t unmoved
+
+cdef uint64_t _knight_attacks[64]
+cdef uint64_t _king_attacks[64]
+cdef uint64_t _pawn_attacks[2][64]
+cdef uint64_t _pawn_pushes[2][64]
+cdef uint64_t _pawn_double_pushes[2][64]
+
+cdef uint64_t _rook_masks[64]
+cdef uint64_t _rook_magics[64]
+cdef int _rook_shifts[64]
+cdef int _rook_offsets[64]
+cdef uint64_t _rook_table[ROOK_TABLE_SIZE]
+
+cdef uint64_t _bishop_masks[64]
+cdef uint64_t _bishop_magics[64]
+cdef int _bishop_shifts[64]
+cdef int _bishop_offsets[64]
+cdef uint64_t _bishop_table[BISHOP_TABLE_SIZE]
+
+
+cdef void _load_tables():
+    cdef int square, index, color, rook_offset = 0, bishop_offset = 0
+    for square in range(64):
+        _knight_attacks[square] = KNIGHT_ATTACKS[square]
+        _king_attacks[square] = KING_ATTACKS[square]
+        for color in COLORS:
+            _pawn_attacks[color][square] = PAWN_ATTACKS[color][square]
+            _pawn_pushes[color][square] = PAWN_PUSHES[color][square]
+            _pawn_double_pushes[color][square] = PAWN_DOUBLE_PUSHES[color][square]
+
+        _rook_masks[square] = ROOK_MASKS[square]
+        _rook_magics[square] = ROOK_MAGICS[square]
+        _rook_shifts[square] = ROOK_SHIFTS[square]
+        _rook_offsets[square] = rook_offset
+        for index in range(len(ROOK_ATTACKS[square])):
+            _rook_table[rook_offset + index] = ROOK_ATTACKS[square][index]
+        rook_offset += len(ROOK_ATTACKS[square])
+
+        _bishop_masks[square] = BISHOP_MASKS[square]
+        _bishop_magics[square] = BISHOP_MAGICS[square]
+        _bishop_shifts[square] = BISHOP_SHIFTS[square]
+        _bishop_offsets[square] = bishop_offset
+        for index in range(len(BISHOP_ATTACKS[square])):
+            _bishop_table[bishop_offset + index] = BISHOP_ATTACKS[square][index]
+        bishop_offset += len(BISHOP_ATTACKS[square])
+
+
+_load_tables()
+
+
+cdef inline uint64_t knight_attacks(int square) nogil:
+    return _knight_attacks[square]
+
+
+cdef inline uint64_t king_attacks(int square) nogil:
+    return _king_attacks[square]
+
+
+cdef inline uint64_t rook_attacks(int square, uint64_t occupied) nogil:
+    return _rook_table[
+        _rook_offsets[square]
+        + <int>(((occupied & _rook_masks[square]) * _rook_magics[square]) >> _rook_shifts[square])
+    ]
+
+
+cdef inline uint64_t bishop_attacks(int square, uint64_t occupied) nogil:
+    return _bishop_table[
+        _bishop_offsets[square]
+        + <int>(((occupied & _bishop_masks[square]) * _bishop_magics[square]) >> _bishop_shifts[square])
+    ]
+
+
+cdef int in_check(PositionData* pos, int color) nogil:
+    cdef uint64_t* enemy = pos.pieces[color ^ 1]
+    cdef uint64_t kings = pos.pieces[color][KING]
+    cdef int square
+    if not kings:
+        return 0
+    square = __builtin_ctzll(kings)
+    if _pawn_attacks[color][square] & enemy[PAWN]:
+        return 1
+    if knight_attacks(square) & enemy[KNIGHT]:
+        return 1
+    if king_attacks(square) & enemy[KING]:
+        return 1
+    if bishop_attacks(square, pos.occupied_all) & (enemy[BISHOP] | enemy[QUEEN]):
+        return 1
+    if rook_attacks(square, pos.occupied_all) & (enemy[ROOK] | enemy[QUEEN]):
+        return 1
+    return 0
+
+
+cdef uint64_t targets(PositionData* pos, int piece_type, int color, int square) nogil:
+    cdef uint64_t result
+    cdef uint64_t empty = ~pos.occupied_all
+    if piece_type == PAWN:
+        result = _pawn_pushes[color][square] & empty
+        if result and (pos.unmoved >> square) & 1:
+            result |= _pawn_double_pushes[color][square] & empty
+        return result | (_pawn_attacks[color][square] & pos.occupied[color ^ 1])
+    if piece_type == KNIGHT:
+        result = knight_attacks(square)
+    elif piece_type == BISHOP:
+        result = bishop_attacks(square, pos.occupied_all)
+    elif piece_type == ROOK:
+        result = rook_attacks(square, pos.occupied_all)
+    elif piece_type == QUEEN:
+        result = rook_attacks(square, pos.occupied_all) | bishop_attacks(square, pos.occupied_all)
+    else:
+        result = king_attacks(square)
+    return result & ~pos.occupied[color]
+
+
+cdef inline int captured_type(PositionData* pos, int color, int square) nogil:
+    cdef int piece_type
+    cdef uint64_t* enemy = pos.pieces[color ^ 1]
+    for piece_type in range(6):
+        if (enemy[piece_type] >> square) & 1:
+            return piece_type
+    return -1
+
+
+cdef inline void make(
+    PositionData* pos, int source, int target, int piece_type, int color, int captured
+) noexcept nogil:
+    cdef uint64_t source_bit = (<uint64_t>1) << source
+    cdef uint64_t target_bit = (<uint64_t>1) << target
+    if captured >= 0:
+        pos.pieces[color ^ 1][captured] ^= target_bit
+        pos.occupied[color ^ 1] ^= target_bit
+    pos.pieces[color][piece_type] ^= source_bit | target_bit
+    pos.occupied[color] ^= source_bit | target_bit
+    pos.occupied_all = pos.occupied[0] | pos.occupied[1]
+    pos.unmoved &= ~(source_bit | target_bit)
+
+
+cdef int has_legal_move(PositionData* pos, int color) nogil:
+    cdef PositionData child
+    cdef int piece_type, source, target
+    cdef uint64_t pieces, moves
+    for piece_type in range(6):
+        pieces = pos.pieces[color][piece_type]
+        while pieces:
+            source = __builtin_ctzll(pieces)
+            pieces &= pieces - 1
+            moves = targets(pos, piece_type, color, source)
+            while moves:
+                target = __builtin_ctzll(moves)
+                moves &= moves - 1
+                child = pos[0]
+                make(
+                    &child, source, target, piece_type, color, captured_type(pos, color, target)
+                )
+                if not in_check(&child, color):
+                    return 1
+    return 0
+
+
+cdef void _load_position(PositionData* pos, board):
+    cdef int color, piece_type
+    pieces = board.pieces
+    for color in COLORS:
+        for piece_type in PIECE_TYPES:
+            pos.pieces[color][piece_type] = pieces[(piece_type, color)]
+        pos.occupied[color] = board.occupancy[color]
+    pos.occupied_all = board.occupied
+    pos.unmoved = board.unmoved
+
+
+cdef class Position:
+    """
+    Copy of the bitboards of a board kept in C, the board updates it in place
+    on every push and pop so that the queries don't have to convert the board.
+    """
+
+    cdef PositionData data
+
+    def __init__(self, board):
+        """
+        Initialize the position from the bitboards of a board.
+
+        :param board: The board to copy
+        """
+        _load_position(&self.data, board)
+
+    def copy(self):
+        """
+        Get an independent copy of the position.
+        """
+        cdef Position position = Position.__new__(Position)
+        position.data = self.data
+        return position
+
+    def push(self, int source, int target, int piece_type, int color, int captured):
+        """
+        Make a move from the source square to the target square.
+
+        :param source: The square of the moved piece
+        :param target: The square the piece is moved to
+        :param piece_type: The type of the moved piece
+        :param color: The color of the moved piece
+        :param captured: The type of the captured piece or -1 if there is none
+        """
+        make(&self.data, source, target, piece_type, color, captured)
+
+    def pop(
+        self,
+        int source,
+        int target,
+        int piece_type,
+        int color,
+        int captured,
+        uint64_t unmoved,
+    ):
+        """
+        Take back a move made with push.
+
+        :param source: The square of the moved piece
+        :param target: The square the piece was moved to
+        :param piece_type: The type of the moved piece
+        :param color: The color of the moved piece
+        :param captured: The type of the captured piece or -1 if there was none
+        :param unmoved: The unmoved bitboard before the move
+        """
+        cdef PositionData* pos = &self.data
+        cdef uint64_t source_bit = (<uint64_t>1) << source
+        cdef uint64_t target_bit = (<uint64_t>1) << target
+        pos.pieces[color][piece_type] ^= source_bit | target_bit
+        pos.occupied[color] ^= source_bit | target_bit
+        if captured >= 0:
+            pos.pieces[color ^ 1][captured] |= target_bit
+            pos.occupied[color ^ 1] |= target_bit
+        pos.occupied_all = pos.occupied[0] | pos.occupied[1]
+        pos.unmoved = unmoved
+
+    def is_check(self, int color):
+        """
+        Check if the given color is currently in check.
+
+        :param color: The color of the player to check for check
+        :return: True if the player is in check, False otherwise
+        """
+        return in_check(&self.data, color) != 0
+
+    def has_legal_move(self, int color):
+        """
+        Check if the given color has any move not leaving its king in check.
+
+        :param color: The color of the player to move
+        :return: True if there is a valid move, False otherwise
+        """
+        cdef int result
+        with nogil:
+            result = has_legal_move(&self.data, color)
+        return result != 0
+
+    def mobility(self, int color):
+        """
+        Get the number of possible moves for the given color.
+
+        :param color: The color of the player whose possible moves are to be counted
+        :return: The number of possible moves
+        """
+        cdef int piece_type, square, result = 0
+        cdef uint64_t pieces
+        for piece_type in range(6):
+            pieces = self.data.pieces[color][piece_type]
+            while pieces:
+                square = __builtin_ctzll(pieces)
+                pieces &= pieces - 1
+                result += __builtin_popcountll(
+                    targets(&self.data, piece_type, color, square)
+                )
+        return result
+
+    def captures(self, int color):
+        """
+        Get the captures of the given color scored by most valuable victim
+        and least valuable attacker.
+
+        :param color: The color of the player to move
+        :return: A list of (score, source, target) tuples
+        """
+        cdef int piece_type, source, target
+        cdef uint64_t pieces, moves
+        result = []
+        for piece_type in range(6):
+            pieces = self.data.pieces[color][piece_type]
+            while pieces:
+                source = __builtin_ctzll(pieces)
+                pieces &= pieces - 1
+                moves = targets(&self.data, piece_type, color, source)
+                moves &= self.data.occupied[color ^ 1]
+                while moves:
+                    target = __builtin_ctzll(moves)
+                    moves &= moves - 1
+                    result.append(
+                        (
+                            captured_type(&self.data, color, target) * 8 - piece_type,
+                            source,
+                            target,
+                        )
+                    )
+        return result
+
+    def quiets(self, int color, history=None):
+        """
+        Get the moves of the given color not capturing a piece scored by history.
+
+        :param color: The color of the player to move
+        :param history: Cutoff scores indexed by [color * 6 + piece type][target square]
+        :return: A list of (score, source, target) tuples
+        """
+        cdef int piece_type, source, target
+        cdef uint64_t pieces, moves
+        result = []
+        for piece_type in range(6):
+            scores = history[color * 6 + piece_type] if history is not None else None
+            pieces = self.data.pieces[color][piece_type]
+            while pieces:
+                source = __builtin_ctzll(pieces)
+                pieces &= pieces - 1
+                moves = targets(&self.data, piece_type, color, source)
+                moves &= ~self.data.occupied_all
+                while moves:
+                    target = __builtin_ctzll(moves)
+                    moves &= moves - 1
+                    result.append(
+                        (scores[target] if scores is not None else 0, source, target)
+                    )
+        return result
+
+    def possible_moves(self, int color):
+        """
+        Get a list of all possible moves for the given color.
+
+        :param color: The color of the player whose possible moves are to be found
+        :return: A list of (row, col) tuples of the target positions
+        """
+        cdef int piece_type, square
+        cdef uint64_t pieces, moves
+        result = []
+        for piece_type in range(6):
+            pieces = self.data.pieces[color][piece_type]
+            while pieces:
+                square = __builtin_ctzll(pieces)
+                pieces &= pieces - 1
+                moves = targets(&self.data, piece_type, color, square)
+                while moves:
+                    square = __builtin_ctzll(moves)
+                    moves &= moves - 1
+                    result.append((square >> 3, square & 7))
+        return result
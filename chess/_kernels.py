@@ -0,0 +1,82 @@
+"""
+Attack generation and check detection compiled to machine code with Numba.
+
+Numba is optional, the board uses the pure Python implementation when it is not installed.
+"""
+
+from numba import boolean, int64, njit, uint64
+
+from .lut import (
+    BISHOP_ATTACKS_LUT,
+    BISHOP_MAGICS_LUT,
+    BISHOP_MASKS_LUT,
+    BISHOP_OFFSETS_LUT,
+    BISHOP_SHIFTS_LUT,
+    KING_ATTACKS_LUT,
+    KNIGHT_ATTACKS_LUT,
+    PAWN_ATTACKS_LUT,
+    ROOK_ATTACKS_LUT,
+    ROOK_MAGICS_LUT,
+    ROOK_MASKS_LUT,
+    ROOK_OFFSETS_LUT,
+    ROOK_SHIFTS_LUT,
+)
+
+
+@njit(uint64(int64), cache=True)
+def knight_attacks(square):
+    return KNIGHT_ATTACKS_LUT[square]
+
+
+@njit(uint64(int64), cache=True)
+def king_attacks(square):
+    return KING_ATTACKS_LUT[square]
+
+
+@njit(uint64(int64, int64), cache=True)
+def pawn_attacks(square, color):
+    return PAWN_ATTACKS_LUT[color, square]
+
+
+@njit(uint64(int64, uint64), cache=True)
+def rook_attacks(square, occupied):
+    index = (
+        (occupied & ROOK_MASKS_LUT[square]) * ROOK_MAGICS_LUT[square]
+    ) >> ROOK_SHIFTS_LUT[square]
+    return ROOK_ATTACKS_LUT[ROOK_OFFSETS_LUT[square] + index]
+
+
+@njit(uint64(int64, uint64), cache=True)
+def bishop_attacks(square, occupied):
+    index = (
+        (occupied & BISHOP_MASKS_LUT[square]) * BISHOP_MAGICS_LUT[square]
+    ) >> BISHOP_SHIFTS_LUT[square]
+    return BISHOP_ATTACKS_LUT[BISHOP_OFFSETS_LUT[square] + index]
+
+
+@njit(boolean(int64, int64, uint64, uint64, uint64, uint64, uint64, uint64), cache=True)
+def in_check(square, color, occupied, pawns, knights, kings, diagonal, orthogonal):
+    """
+    Check if the king standing on the square is attacked by the given enemy pieces.
+
+    :param square: The square of the king
+    :param color: The color of the king
+    :param occupied: The bitboard of all occupied squares
+    :param pawns: The bitboard of enemy pawns
+    :param knights: The bitboard of enemy knights
+    :param kings: The bitboard of the enemy king
+    :param diagonal: The bitboard of enemy bishops and queens
+    :param orthogonal: The bitboard of enemy rooks and queens
+    :return: True if the king is in check, False otherwise
+    """
+    if pawn_attacks(square, color) & pawns:
+        return True
+    if knight_attacks(square) & knights:
+        return True
+    if king_attacks(square) & kings:
+        return True
+    if bishop_attacks(square, occupied) & diagonal:
+        return True
+    if rook_attacks(square, occupied) & orthogonal:
+        return True
+    return False
@@ -0,0 +1,232 @@
+"""
+Perft compiled to machine code with Numba, counting the subtrees of the first moves
+in parallel.
+
+The module is kept apart from chess._kernels, which the board imports, so that
+the perft kernels are only compiled when perft is used.
+"""
+
+import numpy as np
+from numba import boolean, int64, njit, prange, uint64, void
+
+from ._kernels import (
+    bishop_attacks,
+    in_check,
+    king_attacks,
+    knight_attacks,
+    rook_attacks,
+)
+from .const import BISHOP, COLORS, KING, KNIGHT, PAWN, PIECE_TYPES, QUEEN, ROOK
+from .lut import PAWN_ATTACKS_LUT, PAWN_DOUBLE_PUSHES_LUT, PAWN_PUSHES_LUT
+
+_ONE = np.uint64(1)
+_ZERO = np.uint64(0)
+# more than the possible moves of any position
+MAX_MOVES = 256
+
+# multiplying a single bit by the de bruijn sequence puts a distinct 6 bit pattern
+# in the top bits, the square of the bit is looked up by the pattern
+DE_BRUIJN = np.uint64(0x03F79D71B4CB0A89)
+_DE_BRUIJN_SHIFT = np.uint64(58)
+DE_BRUIJN_SQUARES = np.zeros(64, dtype=np.int64)
+for _square in range(64):
+    _pattern = ((1 << _square) * int(DE_BRUIJN) & 0xFFFFFFFFFFFFFFFF) >> 58
+    DE_BRUIJN_SQUARES[_pattern] = _square
+
+
+@njit(int64(uint64), cache=True)
+def lsb(bitboard):
+    return DE_BRUIJN_SQUARES[
+        (bitboard & (~bitboard + _ONE)) * DE_BRUIJN >> _DE_BRUIJN_SHIFT
+    ]
+
+
+@njit(uint64(int64, int64, int64, uint64, uint64, uint64), cache=True)
+def targets(piece_type, color, square, own, enemy, unmoved):
+    """
+    Get the bitboard of squares the piece standing on the given square can move to.
+
+    :param piece_type: The type of the piece
+    :param color: The color of the piece
+    :param square: The square of the piece
+    :param own: The bitboard of the pieces of the same color
+    :param enemy: The bitboard of the enemy pieces
+    :param unmoved: The bitboard of the pieces which did not move yet
+    :return: The bitboard of target squares
+    """
+    occupied = own | enemy
+    if piece_type == PAWN:
+        result = PAWN_PUSHES_LUT[color, square] & ~occupied
+        if result and unmoved >> np.uint64(square) & _ONE:
+            result |= PAWN_DOUBLE_PUSHES_LUT[color, square] & ~occupied
+        return result | PAWN_ATTACKS_LUT[color, square] & enemy
+    if piece_type == KNIGHT:
+        result = knight_attacks(square)
+    elif piece_type == BISHOP:
+        result = bishop_attacks(square, occupied)
+    elif piece_type == ROOK:
+        result = rook_attacks(square, occupied)
+    elif piece_type == QUEEN:
+        result = rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+    else:
+        result = king_attacks(square)
+    return result & ~own
+
+
+@njit(boolean(uint64[:], int64), cache=True)
+def bitboards_in_check(bitboards, color):
+    """
+    Check if the given color is in check.
+
+    :param bitboards: The piece bitboards indexed by color * 6 + piece type
+    :param color: The color of the king
+    :return: True if the king is in check, False otherwise
+    """
+    kings = bitboards[color * 6 + KING]
+    if not kings:
+        return False
+    occupied = _ZERO
+    for index in range(12):
+        occupied |= bitboards[index]
+    enemy = (color ^ 1) * 6
+    queens = bitboards[enemy + QUEEN]
+    return in_check(
+        lsb(kings),
+        color,
+        occupied,
+        bitboards[enemy + PAWN],
+        bitboards[enemy + KNIGHT],
+        bitboards[enemy + KING],
+        bitboards[enemy + BISHOP] | queens,
+        bitboards[enemy + ROOK] | queens,
+    )
+
+
+@njit(int64(uint64[:], int64, int64, int64, int64), cache=True)
+def make(bitboards, piece_type, color, source, target):
+    """
+    Move the piece in place and get the type of the captured piece or -1.
+    """
+    target_bit = _ONE << np.uint64(target)
+    enemy = (color ^ 1) * 6
+    captured = -1
+    for piece_type_index in range(6):
+        if bitboards[enemy + piece_type_index] & target_bit:
+            bitboards[enemy + piece_type_index] ^= target_bit
+            captured = piece_type_index
+            break
+    bitboards[color * 6 + piece_type] ^= _ONE << np.uint64(source) | target_bit
+    return captured
+
+
+@njit(void(uint64[:], int64, int64, int64, int64, int64), cache=True)
+def unmake(bitboards, piece_type, color, source, target, captured):
+    """
+    Take back a move made with make.
+    """
+    target_bit = _ONE << np.uint64(target)
+    bitboards[color * 6 + piece_type] ^= _ONE << np.uint64(source) | target_bit
+    if captured >= 0:
+        bitboards[(color ^ 1) * 6 + captured] |= target_bit
+
+
+@njit(int64(uint64[:], int64, uint64, int64[:, :]), cache=True)
+def generate(bitboards, color, unmoved, moves):
+    """
+    Fill the rows of moves with the (piece type, source, target) of possible moves.
+
+    :return: The number of moves
+    """
+    own = _ZERO
+    enemy = _ZERO
+    for piece_type in range(6):
+        own |= bitboards[color * 6 + piece_type]
+        enemy |= bitboards[(color ^ 1) * 6 + piece_type]
+    count = 0
+    for piece_type in range(6):
+        pieces = bitboards[color * 6 + piece_type]
+        while pieces:
+            source = lsb(pieces)
+            pieces &= pieces - _ONE
+            squares = targets(piece_type, color, source, own, enemy, unmoved)
+            while squares:
+                moves[count, 0] = piece_type
+                moves[count, 1] = source
+                moves[count, 2] = lsb(squares)
+                squares &= squares - _ONE
+                count += 1
+    return count
+
+
+@njit(int64(uint64[:], int64, int64, uint64), cache=True)
+def perft_bitboards(bitboards, color, depth, unmoved):
+    """
+    Count the valid move sequences of the given depth on the bitboards.
+
+    :param bitboards: The piece bitboards indexed by color * 6 + piece type,
+    they are restored before returning
+    :param color: The color of the player to move
+    :param depth: The number of plies, at least 1
+    :param unmoved: The bitboard of the pieces which did not move yet
+    :return: The number of valid move sequences
+    """
+    moves = np.empty((MAX_MOVES, 3), dtype=np.int64)
+    nodes = 0
+    for index in range(generate(bitboards, color, unmoved, moves)):
+        piece_type, source, target = moves[index, 0], moves[index, 1], moves[index, 2]
+        captured = make(bitboards, piece_type, color, source, target)
+        if not bitboards_in_check(bitboards, color):
+            if depth == 1:
+                nodes += 1
+            else:
+                moved = _ONE << np.uint64(source) | _ONE << np.uint64(target)
+                nodes += perft_bitboards(
+                    bitboards, color ^ 1, depth - 1, unmoved & ~moved
+                )
+        unmake(bitboards, piece_type, color, source, target, captured)
+    return nodes
+
+
+@njit(int64(uint64[:], int64, int64, uint64), parallel=True, cache=True)
+def parallel_perft_bitboards(bitboards, color, depth, unmoved):
+    """
+    Count the valid move sequences of the given depth on the bitboards,
+    the subtrees of the first moves are counted in parallel.
+    """
+    moves = np.empty((MAX_MOVES, 3), dtype=np.int64)
+    count = generate(bitboards, color, unmoved, moves)
+    nodes = np.zeros(count, dtype=np.int64)
+    for index in prange(count):
+        piece_type, source, target = moves[index, 0], moves[index, 1], moves[index, 2]
+        child = bitboards.copy()
+        make(child, piece_type, color, source, target)
+        if not bitboards_in_check(child, color):
+            if depth == 1:
+                nodes[index] = 1
+            else:
+                moved = _ONE << np.uint64(source) | _ONE << np.uint64(target)
+                nodes[index] = perft_bitboards(
+                    child, color ^ 1, depth - 1, unmoved & ~moved
+                )
+    return nodes.sum()
+
+
+def perft(board, color: int, depth: int) -> int:
+    """
+    Count the valid move sequences of the given depth on the board.
+
+    :param board: The board to count the moves on
+    :param color: The color of the player to move
+    :param depth: The number of plies
+    :return: The number of valid move sequences
+    :raises ValueError: If the depth is less than 1
+    """
+    if depth < 1:
+        raise ValueError(f"Depth of perft must be at least 1, got {depth}!")
+    bitboards = np.array(
+        [board.pieces[(piece_type, c)] for c in COLORS for piece_type in PIECE_TYPES],
+        dtype=np.uint64,
+    )
+    return int(
+        parallel_perft_bitboards(bitboards, color, depth, np.uint64(board.unmoved))
+    )
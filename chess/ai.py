@@ -0,0 +1,161 @@
+from .bitboard import popcount
+from .const import EMPTY, PIECE_TYPES, PIECE_VALUES
+from .transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+INFINITY = 1_000_000
+# value of being checkmated, reduced by the number of plies to the mate
+MATE = 100_000
+MAX_PLY = 64
+# values beyond it in magnitude are mates found within MAX_PLY plies
+MATE_BOUND = MATE - MAX_PLY
+# value of every possible move a player has over the opponent
+MOBILITY_VALUE = 2
+
+
+def _value_to_table(value: int, ply: int) -> int:
+    """
+    Convert a value of a node at the given ply for storing in the transposition table,
+    mates are stored as the distance from the node instead of the root.
+    """
+    if value >= MATE_BOUND:
+        return value + ply
+    if value <= -MATE_BOUND:
+        return value - ply
+    return value
+
+
+def _value_from_table(value: int, ply: int) -> int:
+    """
+    Convert a value probed from the transposition table back to a node at the given ply.
+    """
+    if value >= MATE_BOUND:
+        return value - ply
+    if value <= -MATE_BOUND:
+        return value + ply
+    return value
+
+
+class AI:
+    """
+    Class representing a minimax based ai searching with alpha-beta pruning.
+    """
+
+    def __init__(self, depth: int = 3, table_size: int = 1 << 16):
+        """
+        Initialize an ai.
+
+        :param depth: The number of plies to search
+        :param table_size: The number of transposition table clusters, a power of two
+        """
+        self.depth = depth
+        self.table = TranspositionTable(table_size)
+        # two most recent quiet moves causing a cutoff per ply
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        # cutoff scores indexed by [color * 6 + piece type][target square]
+        self.history = [[0] * 64 for _ in range(len(PIECE_TYPES) * 2)]
+
+    def evaluate(self, board, color: int) -> int:
+        """
+        Evaluate the board from the perspective of the given color.
+
+        :param board: The board to evaluate
+        :param color: The color of the player to evaluate for
+        :return: The material and mobility balance of the player
+        """
+        value = MOBILITY_VALUE * (
+            board.get_mobility(color) - board.get_mobility(color ^ 1)
+        )
+        for piece_type in PIECE_TYPES:
+            value += PIECE_VALUES[piece_type] * (
+                popcount(board.pieces[(piece_type, color)])
+                - popcount(board.pieces[(piece_type, color ^ 1)])
+            )
+        return value
+
+    def search(self, board, color: int):
+        """
+        Find the best move for the given color.
+
+        :param board: The board to search, it is restored before returning
+        :param color: The color of the player to move
+        :return: The best move as a (source, target) tuple of squares
+        or None if there is no valid move.
+        """
+        alpha, best_move = -INFINITY, None
+        entry = self.table.probe(board.hash)
+        tt_move = entry[3] if entry is not None else None
+        for move in board.generate_moves(color, tt_move, self.killers[0], self.history):
+            undo = board.push(*move)
+            if not board.is_check(color):
+                value = -self._negamax(
+                    board, color ^ 1, self.depth - 1, -INFINITY, -alpha, 1
+                )
+                if value > alpha or best_move is None:
+                    alpha, best_move = value, move
+            board.pop(undo)
+        if best_move is not None:
+            self.table.store(board.hash, self.depth, EXACT, alpha, best_move)
+        return best_move
+
+    def _negamax(self, board, color, depth, alpha, beta, ply):
+        """
+        Get the value of the board for the color to move searched to the given depth.
+        """
+        entry = self.table.probe(board.hash)
+        tt_move = None
+        if entry is not None:
+            entry_depth, flag, value, tt_move = entry
+            value = _value_from_table(value, ply)
+            if entry_depth >= depth and (
+                flag == EXACT
+                or flag == LOWER_BOUND
+                and value >= beta
+                or flag == UPPER_BOUND
+                and value <= alpha
+            ):
+                return value
+        if depth == 0 or ply >= MAX_PLY:
+            return self.evaluate(board, color)
+
+        original_alpha = alpha
+        best_value, best_move = -INFINITY, None
+        for move in board.generate_moves(
+            color, tt_move, self.killers[ply], self.history
+        ):
+            undo = board.push(*move)
+            if board.is_check(color):
+                board.pop(undo)
+                continue
+            value = -self._negamax(board, color ^ 1, depth - 1, -beta, -alpha, ply + 1)
+            board.pop(undo)
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                self._record_cutoff(board, color, move, depth, ply)
+                break
+
+        if best_move is None:
+            return -MATE + ply if board.is_check(color) else 0
+        if best_value <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.table.store(
+            board.hash, depth, flag, _value_to_table(best_value, ply), best_move
+        )
+        return best_value
+
+    def _record_cutoff(self, board, color, move, depth, ply):
+        """
+        Remember a quiet move causing a beta cutoff as a killer and in the history scores.
+        """
+        source, target = move
+        if board.piece_type[target] != EMPTY:
+            return
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1], killers[0] = killers[0], move
+        self.history[color * 6 + board.piece_type[source]][target] += depth * depth
@@ -0,0 +1,46 @@
+from .bitboard import position_of, square_of
+from .const import BOARD_SIZE
+
+KNIGHT_OFFSETS = (
+    (-2, -1),
+    (-2, 1),
+    (-1, -2),
+    (-1, 2),
+    (1, -2),
+    (1, 2),
+    (2, -1),
+    (2, 1),
+)
+KING_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+# row direction of pawns indexed by color, white pawns move towards row 0
+# and black pawns towards the last row
+PAWN_DIRECTIONS = (-1, 1)
+
+
+def _build_table(offsets) -> list[int]:
+    """
+    Build a table of target bitboards indexed by square for a piece moving by fixed offsets.
+
+    :param offsets: The (row, col) offsets the piece can move by
+    :return: A list of 64 bitboards
+    """
+    table = [0] * BOARD_SIZE**2
+    for square in range(BOARD_SIZE**2):
+        row, col = position_of(square)
+        for d_row, d_col in offsets:
+            target_row, target_col = row + d_row, col + d_col
+            if 0 <= target_row < BOARD_SIZE and 0 <= target_col < BOARD_SIZE:
+                table[square] |= 1 << square_of((target_row, target_col))
+    return table
+
+
+KNIGHT_ATTACKS = _build_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _build_table(KING_OFFSETS)
+# pawn tables are indexed by [color][square]
+PAWN_PUSHES = [_build_table(((direction, 0),)) for direction in PAWN_DIRECTIONS]
+PAWN_DOUBLE_PUSHES = [
+    _build_table(((2 * direction, 0),)) for direction in PAWN_DIRECTIONS
+]
+PAWN_ATTACKS = [
+    _build_table(((direction, -1), (direction, 1))) for direction in PAWN_DIRECTIONS
+]
@@ -0,0 +1,281 @@
+import numpy as np
+
+from .const import BISHOP, COLORS, KING, KNIGHT, PAWN, PIECE_TYPES, QUEEN, ROOK
+from .lut import (
+    BISHOP_ATTACKS_LUT,
+    BISHOP_MAGICS_LUT,
+    BISHOP_MASKS_LUT,
+    BISHOP_OFFSETS_LUT,
+    BISHOP_SHIFTS_LUT,
+    KING_ATTACKS_LUT,
+    KNIGHT_ATTACKS_LUT,
+    PAWN_ATTACKS_LUT,
+    PAWN_DOUBLE_PUSHES_LUT,
+    PAWN_PUSHES_LUT,
+    ROOK_ATTACKS_LUT,
+    ROOK_MAGICS_LUT,
+    ROOK_MASKS_LUT,
+    ROOK_OFFSETS_LUT,
+    ROOK_SHIFTS_LUT,
+)
+
+# number of boards expanded at once by perft, bounds the memory of a single ply
+PERFT_CHUNK = 1 << 12
+
+_ONE = np.uint64(1)
+_ZERO = np.uint64(0)
+
+
+def knight_attacks_batch(squares: np.ndarray) -> np.ndarray:
+    """
+    Get the squares attacked by knights standing on each of the given squares.
+
+    :param squares: An array of square indexes
+    :return: An array of attack bitboards
+    """
+    return KNIGHT_ATTACKS_LUT[squares]
+
+
+def king_attacks_batch(squares: np.ndarray) -> np.ndarray:
+    """
+    Get the squares attacked by kings standing on each of the given squares.
+
+    :param squares: An array of square indexes
+    :return: An array of attack bitboards
+    """
+    return KING_ATTACKS_LUT[squares]
+
+
+def rook_attacks_batch(squares: np.ndarray, occupied: np.ndarray) -> np.ndarray:
+    """
+    Get the squares attacked by rooks standing on each of the given squares.
+
+    :param squares: An array of square indexes
+    :param occupied: An array of occupancy bitboards blocking the rooks
+    :return: An array of attack bitboards
+    """
+    index = (
+        (occupied & ROOK_MASKS_LUT[squares]) * ROOK_MAGICS_LUT[squares]
+    ) >> ROOK_SHIFTS_LUT[squares]
+    return ROOK_ATTACKS_LUT[ROOK_OFFSETS_LUT[squares] + index]
+
+
+def bishop_attacks_batch(squares: np.ndarray, occupied: np.ndarray) -> np.ndarray:
+    """
+    Get the squares attacked by bishops standing on each of the given squares.
+
+    :param squares: An array of square indexes
+    :param occupied: An array of occupancy bitboards blocking the bishops
+    :return: An array of attack bitboards
+    """
+    index = (
+        (occupied & BISHOP_MASKS_LUT[squares]) * BISHOP_MAGICS_LUT[squares]
+    ) >> BISHOP_SHIFTS_LUT[squares]
+    return BISHOP_ATTACKS_LUT[BISHOP_OFFSETS_LUT[squares] + index]
+
+
+def lsb_batch(bitboards: np.ndarray) -> np.ndarray:
+    """
+    Get the lowest square set in each of the bitboards.
+
+    :param bitboards: An array of non-empty bitboards
+    :return: An array of square indexes
+    """
+    # the isolated bit is a power of two, its logarithm is exact in float64
+    return np.log2(bitboards & (~bitboards + np.uint64(1))).astype(np.intp)
+
+
+def _squares(bitboards: np.ndarray):
+    """
+    Get the squares set in each of the bitboards.
+
+    :param bitboards: An array of bitboards
+    :return: A tuple of an array of bitboard indexes and an array of square indexes,
+    one pair for every square set
+    """
+    bits = np.unpackbits(bitboards.astype("<u8").view(np.uint8), bitorder="little")
+    return np.divmod(np.flatnonzero(bits), 64)
+
+
+class BoardBatch:
+    """
+    Class representing many boards at once as columns of piece bitboards.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initialize a batch of empty boards.
+
+        :param size: The number of boards in the batch
+        """
+        # bitboards indexed by [color * 6 + piece type, board]
+        self.bb = np.zeros((len(COLORS) * len(PIECE_TYPES), size), dtype=np.uint64)
+        # squares of the pieces which did not move yet, indexed by board
+        self.unmoved = np.zeros(size, dtype=np.uint64)
+
+    @classmethod
+    def _from_arrays(cls, bb: np.ndarray, unmoved: np.ndarray):
+        """
+        Create a batch holding the given bitboards.
+        """
+        batch = cls.__new__(cls)
+        batch.bb = bb
+        batch.unmoved = unmoved
+        return batch
+
+    @classmethod
+    def from_boards(cls, boards):
+        """
+        Create a batch holding the positions of the given boards.
+
+        :param boards: A sequence of chess.board.Board
+        :return: The batch of boards
+        """
+        batch = cls(len(boards))
+        for index, board in enumerate(boards):
+            batch.set(index, board)
+        return batch
+
+    def __len__(self):
+        return self.bb.shape[1]
+
+    def set(self, index: int, board):
+        """
+        Copy the position of a board into the batch.
+
+        :param index: The index of the board in the batch
+        :param board: The chess.board.Board to copy
+        """
+        self.bb[:, index] = [
+            board.pieces[(piece_type, color)]
+            for color in COLORS
+            for piece_type in PIECE_TYPES
+        ]
+        self.unmoved[index] = board.unmoved
+
+    def take(self, indexes):
+        """
+        Get a batch of some of the boards.
+
+        :param indexes: A slice, an index array or a boolean mask of the boards
+        :return: The batch of the selected boards
+        """
+        return self._from_arrays(self.bb[:, indexes], self.unmoved[indexes])
+
+    @property
+    def occupied(self) -> np.ndarray:
+        """
+        Get the occupancy bitboard of every board.
+        """
+        return np.bitwise_or.reduce(self.bb, axis=0)
+
+    def in_check_batch(self, color: int) -> np.ndarray:
+        """
+        Check which boards have the given color in check.
+
+        :param color: The color of the player to check for check
+        :return: A boolean array, True for the boards where the player is in check
+        """
+        kings = self.bb[color * 6 + KING]
+        has_king = kings != 0
+        squares = lsb_batch(np.where(has_king, kings, np.uint64(1)))
+        occupied = self.occupied
+        enemy = self.bb[(color ^ 1) * 6 : (color ^ 1) * 6 + len(PIECE_TYPES)]
+        queens = enemy[QUEEN]
+        attackers = (
+            PAWN_ATTACKS_LUT[color, squares] & enemy[PAWN]
+            | knight_attacks_batch(squares) & enemy[KNIGHT]
+            | king_attacks_batch(squares) & enemy[KING]
+            | bishop_attacks_batch(squares, occupied) & (enemy[BISHOP] | queens)
+            | rook_attacks_batch(squares, occupied) & (enemy[ROOK] | queens)
+        )
+        return has_king & (attackers != 0)
+
+    def children(self, color: int):
+        """
+        Make every possible move of the given color on every board,
+        the moves may leave the king of the color in check.
+
+        :param color: The color of the player to move
+        :return: The batch of the resulting boards
+        """
+        own_rows = slice(color * 6, color * 6 + len(PIECE_TYPES))
+        enemy_rows = slice((color ^ 1) * 6, (color ^ 1) * 6 + len(PIECE_TYPES))
+        own = np.bitwise_or.reduce(self.bb[own_rows], axis=0)
+        enemy = np.bitwise_or.reduce(self.bb[enemy_rows], axis=0)
+        occupied = own | enemy
+
+        # the pieces of the color, as parallel arrays of board, row, square and targets
+        boards, rows, sources, targets = [], [], [], []
+        for piece_type in PIECE_TYPES:
+            board, square = _squares(self.bb[color * 6 + piece_type])
+            if piece_type == PAWN:
+                empty = ~occupied[board]
+                pushes = PAWN_PUSHES_LUT[color, square] & empty
+                first = (pushes != 0) & (
+                    self.unmoved[board] >> square.astype(np.uint64) & _ONE != 0
+                )
+                target = (
+                    pushes
+                    | np.where(first, PAWN_DOUBLE_PUSHES_LUT[color, square], _ZERO)
+                    & empty
+                    | PAWN_ATTACKS_LUT[color, square] & enemy[board]
+                )
+            else:
+                blockers = occupied[board]
+                if piece_type == KNIGHT:
+                    target = knight_attacks_batch(square)
+                elif piece_type == BISHOP:
+                    target = bishop_attacks_batch(square, blockers)
+                elif piece_type == ROOK:
+                    target = rook_attacks_batch(square, blockers)
+                elif piece_type == QUEEN:
+                    target = rook_attacks_batch(square, blockers)
+                    target |= bishop_attacks_batch(square, blockers)
+                else:
+                    target = king_attacks_batch(square)
+                target = target & ~own[board]
+            boards.append(board)
+            rows.append(np.full(len(board), color * 6 + piece_type))
+            sources.append(square)
+            targets.append(target)
+
+        piece, target = _squares(np.concatenate(targets))
+        board = np.concatenate(boards)[piece]
+        target_bit = _ONE << target.astype(np.uint64)
+        moved = _ONE << np.concatenate(sources)[piece].astype(np.uint64) | target_bit
+        bb = self.bb[:, board]
+        bb[enemy_rows] &= ~target_bit
+        bb[np.concatenate(rows)[piece], np.arange(len(board))] ^= moved
+        return self._from_arrays(bb, self.unmoved[board] & ~moved)
+
+
+def perft(board, color: int, depth: int) -> int:
+    """
+    Count the valid move sequences of the given depth, expanding the boards
+    of every ply in batches.
+
+    :param board: The board to count the moves on
+    :param color: The color of the player to move
+    :param depth: The number of plies
+    :return: The number of valid move sequences
+    :raises ValueError: If the depth is less than 1
+    """
+    if depth < 1:
+        raise ValueError(f"Depth of perft must be at least 1, got {depth}!")
+    return _perft(BoardBatch.from_boards([board]), color, depth)
+
+
+def _perft(batch, color, depth):
+    """
+    Count the valid move sequences of the given depth from all boards of the batch.
+    """
+    nodes = 0
+    for start in range(0, len(batch), PERFT_CHUNK):
+        children = batch.take(slice(start, start + PERFT_CHUNK)).children(color)
+        valid = ~children.in_check_batch(color)
+        if depth == 1:
+            nodes += int(np.count_nonzero(valid))
+        else:
+            nodes += _perft(children.take(valid), color ^ 1, depth - 1)
+    return nodes
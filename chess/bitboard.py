@@ -0,0 +1,67 @@
+from .const import BOARD_SIZE
+
+
+def square_of(position: tuple[int, int]) -> int:
+    """
+    Get the bitboard square index of a board position.
+
+    :param position: The (row, col) position on the board
+    :return: The square index, the piece on it is represented by bit 1 << square
+    """
+    row, col = position
+    return row * BOARD_SIZE + col
+
+
+def is_on_board(position: tuple[int, int]) -> bool:
+    """
+    Check if the position lies on the board, square_of does not check it.
+
+    :param position: The (row, col) position to check
+    :return: True if both row and col are within the board, False otherwise
+    """
+    row, col = position
+    return 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE
+
+
+def position_of(square: int) -> tuple[int, int]:
+    """
+    Get the board position of a bitboard square index.
+
+    :param square: The square index
+    :return: The (row, col) position on the board
+    """
+    return square >> 3, square & 7
+
+
+def popcount(bitboard: int) -> int:
+    """
+    Count the squares set in the bitboard.
+
+    :param bitboard: The bitboard to count
+    :return: The number of set squares
+    """
+    return bitboard.bit_count()
+
+
+def lsb(bitboard: int) -> int:
+    """
+    Get the lowest square set in the bitboard.
+
+    :param bitboard: The bitboard to scan, must not be empty
+    :return: The square index of the least significant bit
+    """
+    return (bitboard & -bitboard).bit_length() - 1
+
+
+def iter_bits(bitboard: int):
+    """
+    Iterate over the squares set in the bitboard, from the least significant bit.
+
+    :param bitboard: The bitboard to iterate over
+    :return: A generator of square indexes
+    """
+    while bitboard:
+        # lsb inlined, this loop runs for every piece and every move target
+        bit = bitboard & -bitboard
+        yield bit.bit_length() - 1
+        bitboard ^= bit
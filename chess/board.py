@@ -1,5 +1,84 @@
-from .const import COLOR_WHITE, COLOR_BLACK
-from .piece import Pawn, Rook, Knight, Bishop, Queen, King
+from array import array
+
+from .attack_tables import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    PAWN_DOUBLE_PUSHES,
+    PAWN_PUSHES,
+)
+from .bitboard import (
+    is_on_board,
+    iter_bits,
+    lsb,
+    popcount,
+    position_of,
+    square_of,
+)
+from .const import (
+    COLOR_WHITE,
+    COLOR_BLACK,
+    COLORS,
+    EMPTY,
+    PIECE_TYPES,
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    QUEEN,
+    KING,
+)
+from .exception import InvalidMoveException
+from .magics import bishop_attacks, queen_attacks, rook_attacks
+from .move import MoveUndo
+from .piece import HasMovedMixin, Pawn, Rook, Knight, Bishop, Queen, King
+from .zobrist import ZOBRIST, ZOBRIST_CASTLE, ZOBRIST_SIDE, castling_rights
+
+try:
+    from . import _core
+except ImportError:  # the compiled kernel is optional, see chess/_core.pyx
+    _core = None
+try:
+    from . import _kernels
+except ImportError:  # numba is optional, see chess/_kernels.py
+    _kernels = None
+
+# piece classes indexed by piece type
+PIECE_CLASSES = (Pawn, Knight, Bishop, Rook, Queen, King)
+
+
+def _get_starting_state():
+    """
+    Get the grid of pieces of the starting position.
+    """
+    return [
+        [
+            Rook(position=(0, 0), color=COLOR_BLACK),
+            Knight(position=(0, 1), color=COLOR_BLACK),
+            Bishop(position=(0, 2), color=COLOR_BLACK),
+            Queen(position=(0, 3), color=COLOR_BLACK),
+            King(position=(0, 4), color=COLOR_BLACK),
+            Bishop(position=(0, 5), color=COLOR_BLACK),
+            Knight(position=(0, 6), color=COLOR_BLACK),
+            Rook(position=(0, 7), color=COLOR_BLACK),
+        ],
+        [Pawn(position=(1, col), color=COLOR_BLACK) for col in range(8)],
+        [None] * 8,
+        [None] * 8,
+        [None] * 8,
+        [None] * 8,
+        [Pawn(position=(6, col), color=COLOR_WHITE) for col in range(8)],
+        [
+            Rook(position=(7, 0), color=COLOR_WHITE),
+            Knight(position=(7, 1), color=COLOR_WHITE),
+            Bishop(position=(7, 2), color=COLOR_WHITE),
+            Queen(position=(7, 3), color=COLOR_WHITE),
+            King(position=(7, 4), color=COLOR_WHITE),
+            Bishop(position=(7, 5), color=COLOR_WHITE),
+            Knight(position=(7, 6), color=COLOR_WHITE),
+            Rook(position=(7, 7), color=COLOR_WHITE),
+        ],
+    ]
 
 
 class Board:
@@ -11,41 +90,100 @@ class Board:
         """
         Initialize a board.
 
-        :param state: The state of the board
+        :param state: The state of the board as a grid of pieces,
+            the starting position is used if not given
         :type state: list[list]
         """
-        self.state = (
-            [
-                [
-                    Rook(position=(0, 0), color=COLOR_BLACK),
-                    Knight(position=(0, 1), color=COLOR_BLACK),
-                    Bishop(position=(0, 2), color=COLOR_BLACK),
-                    Queen(position=(0, 3), color=COLOR_BLACK),
-                    King(position=(0, 4), color=COLOR_BLACK),
-                    Bishop(position=(0, 5), color=COLOR_BLACK),
-                    Knight(position=(0, 6), color=COLOR_BLACK),
-                    Rook(position=(0, 7), color=COLOR_BLACK),
-                ],
-                [Pawn(position=(1, col), color=COLOR_BLACK) for col in range(8)],
-                [None] * 8,
-                [None] * 8,
-                [None] * 8,
-                [None] * 8,
-                [Pawn(position=(6, col), color=COLOR_WHITE) for col in range(8)],
-                [
-                    Rook(position=(7, 0), color=COLOR_WHITE),
-                    Knight(position=(7, 1), color=COLOR_WHITE),
-                    Bishop(position=(7, 2), color=COLOR_WHITE),
-                    Queen(position=(7, 3), color=COLOR_WHITE),
-                    King(position=(7, 4), color=COLOR_WHITE),
-                    Bishop(position=(7, 5), color=COLOR_WHITE),
-                    Knight(position=(7, 6), color=COLOR_WHITE),
-                    Rook(position=(7, 7), color=COLOR_WHITE),
-                ],
-            ]
-            if state is None
-            else state
-        )
+        if state is None:
+            # copy the prebuilt starting position instead of placing every piece
+            self._copy_from(_STARTING_BOARD)
+            return
+
+        # one bitboard per (piece type, color), bit 1 << (row * 8 + col) is set
+        # if the square is occupied by such piece
+        self.pieces = {
+            (piece_type, color): 0 for piece_type in PIECE_TYPES for color in COLORS
+        }
+        # occupancy bitboard of each color, indexed by color
+        self.occupancy = [0, 0]
+        # squares of the pieces tracking has_moved which did not move yet
+        self.unmoved = 0
+        # piece type and color of every square, mirroring the bitboards
+        # for constant time lookups of the piece standing on a square
+        self.piece_type = array("b", [EMPTY] * 64)
+        self.piece_color = array("b", [EMPTY] * 64)
+        for row, pieces in enumerate(state):
+            for col, piece in enumerate(pieces):
+                if piece is None:
+                    continue
+                square = square_of((row, col))
+                bit = 1 << square
+                piece_type = piece.PIECE_TYPE
+                self.pieces[(piece_type, piece.color)] |= bit
+                self.piece_type[square] = piece_type
+                self.piece_color[square] = piece.color
+                self.occupancy[piece.color] |= bit
+                if isinstance(piece, HasMovedMixin) and not piece.has_moved:
+                    self.unmoved |= bit
+        self.occupied = self.occupancy[COLOR_WHITE] | self.occupancy[COLOR_BLACK]
+        # square of each color's king, kept up to date by push and pop
+        self._king_sq = {
+            color: (
+                lsb(self.pieces[(KING, color)]) if self.pieces[(KING, color)] else None
+            )
+            for color in COLORS
+        }
+        # zobrist hash of the position, kept up to date by push and pop
+        self.hash = ZOBRIST_CASTLE[castling_rights(self.unmoved)]
+        for square in iter_bits(self.occupied):
+            piece = self.piece_color[square] * 6 + self.piece_type[square]
+            self.hash ^= ZOBRIST[piece][square]
+        # possible moves per color with the version of the board they were found at,
+        # the version is bumped by every push and pop
+        self._move_cache = {}
+        self._version = 0
+        # copy of the bitboards in the compiled kernel, kept up to date by push and pop
+        self._position = _core.Position(self) if _core is not None else None
+
+    def _copy_from(self, board):
+        """
+        Initialize the board state as a copy of another board.
+        """
+        self.pieces = dict(board.pieces)
+        self.occupancy = list(board.occupancy)
+        self.unmoved = board.unmoved
+        self.piece_type = array("b", board.piece_type)
+        self.piece_color = array("b", board.piece_color)
+        self.occupied = board.occupied
+        self._king_sq = dict(board._king_sq)
+        self.hash = board.hash
+        self._move_cache = {}
+        self._version = 0
+        self._position = board._position.copy() if _core is not None else None
+
+    def copy(self):
+        """
+        Get an independent copy of the board.
+
+        :return: The copied board.
+        :rtype: Board
+        """
+        board = Board.__new__(Board)
+        board._copy_from(self)
+        return board
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the compiled position can't be pickled, it is rebuilt from the bitboards
+        state["_position"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._position = _core.Position(self) if _core is not None else None
 
     def update(self, piece_position, target_position):
         """
@@ -55,95 +193,413 @@ class Board:
         :type piece_position: tuple[int, int]
         :param target_position: The position where the piece should be moved to.
         :type target_position: tuple[int, int]
+        :raises InvalidMoveException: If a position is off the board, there is no piece
+            at piece_position, or target_position holds a piece of the same color.
+        """
+        if not is_on_board(piece_position) or not is_on_board(target_position):
+            raise InvalidMoveException(
+                f"Move from {piece_position} to {target_position} is off the board!"
+            )
+        source, target = square_of(piece_position), square_of(target_position)
+        if self.piece_type[source] == EMPTY:
+            raise InvalidMoveException(f"There is no piece at {piece_position}!")
+        if self.occupancy[self.piece_color[source]] >> target & 1:
+            raise InvalidMoveException(
+                f"Move from {piece_position} to {target_position} is invalid!"
+            )
+        self.push(source, target)
+
+    def push(self, source, target):
+        """
+        Make a move from the source square to the target square in place,
+        the target must not hold a piece of the moving color.
+
+        :param source: The square of the piece to be moved.
+        :type source: int
+        :param target: The square where the piece should be moved to.
+        :type target: int
+        :return: The state needed to take the move back with pop.
+        :rtype: chess.move.MoveUndo
+        :raises InvalidMoveException: If there is no piece at the source square.
+        """
+        source_bit, target_bit = 1 << source, 1 << target
+        piece_type = self.piece_type[source]
+        if piece_type == EMPTY:
+            raise InvalidMoveException(f"There is no piece at {position_of(source)}!")
+
+        color = self.piece_color[source]
+        captured_type = self.piece_type[target]
+        captured_color = self.piece_color[target]
+        undo = MoveUndo(
+            source,
+            target,
+            captured_type,
+            captured_color,
+            self.unmoved,
+            self.hash,
+        )
+        keys = ZOBRIST[color * 6 + piece_type]
+        self.hash ^= ZOBRIST_SIDE ^ keys[source] ^ keys[target]
+        if captured_type != EMPTY:
+            self.pieces[(captured_type, captured_color)] ^= target_bit
+            self.hash ^= ZOBRIST[captured_color * 6 + captured_type][target]
+            if captured_type == KING:
+                self._king_sq[captured_color] = None
+        if piece_type == KING:
+            self._king_sq[color] = target
+        self.pieces[(piece_type, color)] ^= source_bit | target_bit
+        self.piece_type[target], self.piece_color[target] = piece_type, color
+        self.piece_type[source] = self.piece_color[source] = EMPTY
+
+        self.occupancy[color] ^= source_bit | target_bit
+        self.occupancy[color ^ 1] &= ~target_bit
+        self.occupied = self.occupancy[COLOR_WHITE] | self.occupancy[COLOR_BLACK]
+        if self.unmoved & (source_bit | target_bit):
+            self.hash ^= ZOBRIST_CASTLE[castling_rights(self.unmoved)]
+            self.unmoved &= ~(source_bit | target_bit)
+            self.hash ^= ZOBRIST_CASTLE[castling_rights(self.unmoved)]
+        if self._position is not None:
+            self._position.push(source, target, piece_type, color, captured_type)
+        self._version += 1
+        return undo
+
+    def pop(self, undo):
+        """
+        Take back a move made with push, the moves pushed after it must be popped first.
+
+        :param undo: The state returned by push.
+        :type undo: chess.move.MoveUndo
+        """
+        source, target = undo.source, undo.target
+        source_bit, target_bit = 1 << source, 1 << target
+        piece_type = self.piece_type[target]
+        color = self.piece_color[target]
+        self.pieces[(piece_type, color)] ^= source_bit | target_bit
+        self.piece_type[source], self.piece_color[source] = piece_type, color
+        self.piece_type[target] = undo.captured_type
+        self.piece_color[target] = undo.captured_color
+        if piece_type == KING:
+            self._king_sq[color] = source
+
+        self.occupancy[color] ^= source_bit | target_bit
+        if undo.captured_type != EMPTY:
+            self.pieces[(undo.captured_type, undo.captured_color)] |= target_bit
+            self.occupancy[undo.captured_color] |= target_bit
+            if undo.captured_type == KING:
+                self._king_sq[undo.captured_color] = target
+        self.occupied = self.occupancy[COLOR_WHITE] | self.occupancy[COLOR_BLACK]
+        self.unmoved = undo.unmoved
+        self.hash = undo.hash
+        if self._position is not None:
+            self._position.pop(
+                source, target, piece_type, color, undo.captured_type, undo.unmoved
+            )
+        self._version += 1
+
+    def get_occupied(self, color):
         """
-        raise NotImplementedError
+        Get the bitboard of squares occupied by pieces of the given color.
+
+        :param color: The color of the pieces.
+        :type color: int
+        :return: The occupancy bitboard.
+        :rtype: int
+        """
+        return self.occupancy[color]
 
     def get_pieces(self, color):
         """
-        Get a list of all pieces on board of the given color.
+        Iterate over all pieces on board of the given color.
 
         :param color: The color of the player whose possible moves are to be found.
-        :type color: str
-        :return: A list pieces.
-        :rtype: list[chess.piece.Piece]
+        :type color: int
+        :return: A generator of pieces.
+        :rtype: collections.abc.Iterator[chess.piece.Piece]
+        """
+        for square in iter_bits(self.occupancy[color]):
+            yield self._piece_at(square)
+
+    def _piece_at(self, square):
+        """
+        Create a piece instance for the piece standing on the given square.
         """
-        return list(
-            filter(lambda piece: piece is not None and piece.color == color),
-            [piece for row in self.state for piece in row],
+        piece_type = self.piece_type[square]
+        if piece_type == EMPTY:
+            return None
+        piece = PIECE_CLASSES[piece_type](
+            position=position_of(square), color=self.piece_color[square]
         )
+        if isinstance(piece, HasMovedMixin):
+            piece.has_moved = not self.unmoved >> square & 1
+        return piece
 
     def get_possible_moves(self, color):
         """
-        Get a list of all possible moves for the given color on the current board state.
+        Get all possible moves for the given color on the current board state.
 
         :param color: The color of the player whose possible moves are to be found.
-        :type color: str
-        :return: A list of tuples representing all possible moves for the given color.
-        :rtype: list[tuple[int, int]]
+        :type color: int
+        :return: A tuple of tuples representing all possible moves for the given color.
+        :rtype: tuple[tuple[int, int], ...]
         """
-        return [
-            piece.get_possible_moves()
-            for piece in self.get_pieces(color)
-            if piece.get_possible_moves is not None
-        ]
+        entry = self._move_cache.get(color)
+        if entry is not None and entry[0] == self._version:
+            return entry[1]
+        if self._position is not None:
+            moves = tuple(self._position.possible_moves(color))
+        else:
+            moves = tuple(
+                position_of(target)
+                for piece_type in PIECE_TYPES
+                for square in iter_bits(self.pieces[(piece_type, color)])
+                for target in iter_bits(self._get_targets(piece_type, color, square))
+            )
+        self._move_cache[color] = (self._version, moves)
+        return moves
+
+    def get_mobility(self, color):
+        """
+        Get the number of possible moves for the given color on the current board state.
+
+        :param color: The color of the player whose possible moves are to be counted.
+        :type color: int
+        :return: The number of possible moves.
+        :rtype: int
+        """
+        if self._position is not None:
+            return self._position.mobility(color)
+        return sum(
+            popcount(self._get_targets(piece_type, color, square))
+            for piece_type in PIECE_TYPES
+            for square in iter_bits(self.pieces[(piece_type, color)])
+        )
+
+    def generate_moves(self, color, tt_move=None, killers=(), history=None):
+        """
+        Generate possible moves for the given color in stages ordered for search:
+        the transposition table move, captures by most valuable victim and least
+        valuable attacker, killer moves and the remaining quiet moves by history score.
+        Quiet moves are only generated if the captures did not suffice.
+
+        :param color: The color of the player whose moves are to be generated.
+        :type color: int
+        :param tt_move: The best move stored in the transposition table.
+        :type tt_move: tuple[int, int] or None
+        :param killers: Quiet moves which caused a cutoff at the same ply.
+        :type killers: collections.abc.Iterable[tuple[int, int] or None]
+        :param history: Cutoff scores indexed by [color * 6 + piece type][target square].
+        :type history: list[list[int]] or None
+        :return: A generator of (source, target) square tuples.
+        :rtype: collections.abc.Iterator[tuple[int, int]]
+        """
+        if tt_move is not None and self._is_possible(color, *tt_move):
+            yield tt_move
+
+        if self._position is not None:
+            captures = self._position.captures(color)
+        else:
+            enemy = self.occupancy[color ^ 1]
+            captures = []
+            for piece_type in PIECE_TYPES:
+                for source in iter_bits(self.pieces[(piece_type, color)]):
+                    for target in iter_bits(
+                        self._get_targets(piece_type, color, source) & enemy
+                    ):
+                        # piece types are ordered by value
+                        score = self.piece_type[target] * 8 - piece_type
+                        captures.append((score, source, target))
+        captures.sort(reverse=True)
+        for _, source, target in captures:
+            if (source, target) != tt_move:
+                yield source, target
+
+        skipped = {tt_move}
+        for killer in killers:
+            if (
+                killer is not None
+                and killer not in skipped
+                and not self.occupied >> killer[1] & 1
+                and self._is_possible(color, *killer)
+            ):
+                skipped.add(killer)
+                yield killer
+
+        if self._position is not None:
+            quiets = self._position.quiets(color, history)
+        else:
+            quiets = []
+            for piece_type in PIECE_TYPES:
+                scores = (
+                    history[color * 6 + piece_type] if history is not None else None
+                )
+                for source in iter_bits(self.pieces[(piece_type, color)]):
+                    for target in iter_bits(
+                        self._get_targets(piece_type, color, source) & ~self.occupied
+                    ):
+                        score = scores[target] if scores is not None else 0
+                        quiets.append((score, source, target))
+        quiets.sort(reverse=True)
+        for _, source, target in quiets:
+            if (source, target) not in skipped:
+                yield source, target
+
+    def _is_possible(self, color, source, target):
+        """
+        Check if the piece of color on the source square can move to the target square.
+        """
+        piece_type = self.piece_type[source]
+        if piece_type == EMPTY or self.piece_color[source] != color:
+            return False
+        return bool(self._get_targets(piece_type, color, source) >> target & 1)
+
+    def _get_targets(self, piece_type, color, square):
+        """
+        Get the bitboard of squares the piece standing on the given square can move to,
+        sliding pieces are stopped by blockers and no piece can capture its own color.
+        """
+        if piece_type == PAWN:
+            empty = ~self.occupied
+            targets = PAWN_PUSHES[color][square] & empty
+            if targets and self.unmoved >> square & 1:
+                targets |= PAWN_DOUBLE_PUSHES[color][square] & empty
+            return targets | PAWN_ATTACKS[color][square] & self.occupancy[color ^ 1]
+        if piece_type == KNIGHT:
+            targets = KNIGHT_ATTACKS[square]
+        elif piece_type == BISHOP:
+            targets = bishop_attacks(square, self.occupied)
+        elif piece_type == ROOK:
+            targets = rook_attacks(square, self.occupied)
+        elif piece_type == QUEEN:
+            targets = queen_attacks(square, self.occupied)
+        else:
+            targets = KING_ATTACKS[square]
+        return targets & ~self.occupancy[color]
 
     def get_state(self, color, position):
         """
         Get the state of a given position on the board from given color perspective.
 
         :param color: The color of the player requesting the state.
-        :type color: str
+        :type color: int
         :param position: The position on the board to get the state of.
         :type position: tuple[int, int]
         :return: True if there is no piece of given color at the position and False otherwise
         :rtype: bool
         """
-        row, col = position
-        if getattr(self.state[row][col], "color") == color:
-            return False
-        return True
+        return not self.get_occupied(color) >> square_of(position) & 1
 
     def get_king_position(self, color):
         """
         Get the position of the king for the given color.
 
         :param color: The color of the king to find.
-        :type color: str
+        :type color: int
         :return: A tuple representing the position of the king.
         :rtype: tuple[int, int] or None
         """
-        for row in self.state:
-            for piece in row:
-                if isinstance(piece, King) and piece.color == color:
-                    return piece.position
-        return None
+        square = self._king_sq[color]
+        if square is None:
+            return None
+        return position_of(square)
 
     def is_check(self, color):
         """
         Check if the given color is currently in check.
 
         :param color: The color of the player to check for check.
-        :type color: str
+        :type color: int
         :return: True if the player is in check, False otherwise.
         """
-        enemy_moves = self.get_possible_moves(
-            color=COLOR_BLACK if color == COLOR_WHITE else COLOR_WHITE
-        )
-        king_position = self.get_king_position(color=color)
-        if king_position in enemy_moves:
+        if self._position is not None:
+            return self._position.is_check(color)
+        square = self._king_sq[color]
+        if square is None:
+            return False
+        # look from the king square as if it was each piece type in turn,
+        # any enemy piece of that type found this way gives check
+        enemy = color ^ 1
+        pieces = self.pieces
+        if _kernels is not None:
+            queens = pieces[(QUEEN, enemy)]
+            return _kernels.in_check(
+                square,
+                color,
+                self.occupied,
+                pieces[(PAWN, enemy)],
+                pieces[(KNIGHT, enemy)],
+                pieces[(KING, enemy)],
+                pieces[(BISHOP, enemy)] | queens,
+                pieces[(ROOK, enemy)] | queens,
+            )
+        if PAWN_ATTACKS[color][square] & pieces[(PAWN, enemy)]:
+            return True
+        if KNIGHT_ATTACKS[square] & pieces[(KNIGHT, enemy)]:
+            return True
+        if KING_ATTACKS[square] & pieces[(KING, enemy)]:
+            return True
+        queens = pieces[(QUEEN, enemy)]
+        if bishop_attacks(square, self.occupied) & (pieces[(BISHOP, enemy)] | queens):
+            return True
+        if rook_attacks(square, self.occupied) & (pieces[(ROOK, enemy)] | queens):
             return True
         return False
 
+    def is_valid_move(self, piece_position, target_position):
+        """
+        Check if moving the piece at piece_position to target_position is valid,
+        the move has to be possible and must not leave the own king in check.
+
+        :param piece_position: The position of the piece to be moved.
+        :type piece_position: tuple[int, int]
+        :param target_position: The position where the piece should be moved to.
+        :type target_position: tuple[int, int]
+        :return: True if the move is valid, False otherwise.
+        :rtype: bool
+        """
+        if not is_on_board(piece_position) or not is_on_board(target_position):
+            return False
+        source = square_of(piece_position)
+        piece_type = self.piece_type[source]
+        if piece_type == EMPTY:
+            return False
+        color = self.piece_color[source]
+        target = square_of(target_position)
+        if not self._get_targets(piece_type, color, source) >> target & 1:
+            return False
+        return self._is_safe(color, source, target)
+
+    def _is_safe(self, color, source, target):
+        """
+        Check if the move from source to target does not leave the king of color in check.
+        """
+        undo = self.push(source, target)
+        in_check = self.is_check(color)
+        self.pop(undo)
+        return not in_check
+
+    def _has_valid_move(self, color):
+        """
+        Check if the given color has any valid move, stops at the first one found.
+        """
+        if self._position is not None:
+            return self._position.has_legal_move(color)
+        for piece_type in PIECE_TYPES:
+            for source in iter_bits(self.pieces[(piece_type, color)]):
+                for target in iter_bits(self._get_targets(piece_type, color, source)):
+                    if self._is_safe(color, source, target):
+                        return True
+        return False
+
     def is_checkmate(self, color):
         """
         Check if the given color is currently in checkmate.
 
         :param color: The color of the player to check for checkmate.
-        :type color: str
+        :type color: int
         :return: True if the player is in checkmate, False otherwise.
         :rtype: bool
         """
-        if self.is_check(color=color) and len(self.get_possible_moves(color)) == 0:
+        if self.is_check(color=color) and not self._has_valid_move(color):
             return True
         return False
 
@@ -152,8 +608,13 @@ class Board:
         Check if the given color is currently in stalemate.
 
         :param color: The color of the player to check for stalemate.
-        :type color: str
+        :type color: int
         :return: True if the player is in stalemate, False otherwise.
         :rtype: bool
         """
-        raise NotImplementedError
+        if not self.is_check(color=color) and not self._has_valid_move(color):
+            return True
+        return False
+
+
+_STARTING_BOARD = Board(_get_starting_state())
@@ -1,3 +1,18 @@
-COLOR_WHITE = "white"
-COLOR_BLACK = "black"
+# colors are small ints so that they can index tables directly,
+# the opposite color of color is color ^ 1
+COLOR_WHITE = 0
+COLOR_BLACK = 1
+COLORS = (COLOR_WHITE, COLOR_BLACK)
 BOARD_SIZE = 8
+
+PAWN = 0
+KNIGHT = 1
+BISHOP = 2
+ROOK = 3
+QUEEN = 4
+KING = 5
+PIECE_TYPES = (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING)
+# piece type of an empty square in per-square piece type arrays
+EMPTY = -1
+# material values indexed by piece type, the king can't be traded
+PIECE_VALUES = (100, 320, 330, 500, 900, 0)
@@ -0,0 +1,52 @@
+"""
+Attack tables as uint64 numpy arrays for vectorized and compiled lookups.
+"""
+
+import numpy as np
+
+from .attack_tables import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    PAWN_DOUBLE_PUSHES,
+    PAWN_PUSHES,
+)
+from .magics import (
+    BISHOP_ATTACKS,
+    BISHOP_MAGICS,
+    BISHOP_MASKS,
+    BISHOP_SHIFTS,
+    ROOK_ATTACKS,
+    ROOK_MAGICS,
+    ROOK_MASKS,
+    ROOK_SHIFTS,
+)
+
+
+def _flatten(tables):
+    """
+    Concatenate per-square attack tables into one array and the offsets of each square.
+    """
+    offsets = np.cumsum([0] + [len(table) for table in tables[:-1]]).astype(np.uint64)
+    return (
+        np.concatenate([np.array(table, dtype=np.uint64) for table in tables]),
+        offsets,
+    )
+
+
+KNIGHT_ATTACKS_LUT = np.array(KNIGHT_ATTACKS, dtype=np.uint64)
+KING_ATTACKS_LUT = np.array(KING_ATTACKS, dtype=np.uint64)
+# indexed by [color, square]
+PAWN_ATTACKS_LUT = np.array(PAWN_ATTACKS, dtype=np.uint64)
+PAWN_PUSHES_LUT = np.array(PAWN_PUSHES, dtype=np.uint64)
+PAWN_DOUBLE_PUSHES_LUT = np.array(PAWN_DOUBLE_PUSHES, dtype=np.uint64)
+
+ROOK_MASKS_LUT = np.array(ROOK_MASKS, dtype=np.uint64)
+ROOK_MAGICS_LUT = np.array(ROOK_MAGICS, dtype=np.uint64)
+ROOK_SHIFTS_LUT = np.array(ROOK_SHIFTS, dtype=np.uint64)
+ROOK_ATTACKS_LUT, ROOK_OFFSETS_LUT = _flatten(ROOK_ATTACKS)
+
+BISHOP_MASKS_LUT = np.array(BISHOP_MASKS, dtype=np.uint64)
+BISHOP_MAGICS_LUT = np.array(BISHOP_MAGICS, dtype=np.uint64)
+BISHOP_SHIFTS_LUT = np.array(BISHOP_SHIFTS, dtype=np.uint64)
+BISHOP_ATTACKS_LUT, BISHOP_OFFSETS_LUT = _flatten(BISHOP_ATTACKS)
@@ -0,0 +1,180 @@
+from array import array
+
+from .bitboard import position_of, square_of
+from .const import BOARD_SIZE
+
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+BITBOARD_MASK = 0xFFFFFFFFFFFFFFFF
+
+# magic multipliers mapping every blocker configuration of a square's relevant
+# occupancy mask to a distinct slot of its attack table without destructive collisions
+# fmt: off
+ROOK_MAGICS = array(
+    "Q",
+    [
+        0x258000815028C000, 0x0540021002442000, 0x8100110020000842, 0x4080100008008004,
+        0x8200100802000520, 0x0200100804020001, 0x0880020015000880, 0x0300042610408100,
+        0x0600802080004005, 0x0800402010004000, 0x4284801002802000, 0x1001000821001002,
+        0x0002808004000800, 0x0002001002000408, 0x0045001412000100, 0x00820021088C4402,
+        0x0140008000288840, 0x1020014001300048, 0x6060008010002082, 0x0038010100100020,
+        0x0208004004020040, 0x1800808002000400, 0x2C00040001081002, 0x00009A0001004484,
+        0x1200400080208000, 0x00C0004040201000, 0x4000200080100080, 0x0000080080100080,
+        0x0020040080800800, 0x8080040080020080, 0x0084020400081001, 0x6000040200284889,
+        0x0080002000404000, 0x6070004000402000, 0x2000204082001200, 0x0020100101000C21,
+        0x0403080101000411, 0x5040040080800200, 0x020E000406000809, 0x0000010082000044,
+        0x000040008000802A, 0xA810052008484000, 0x0030002000808010, 0x4000100008008080,
+        0x8008080011010005, 0x1801401004880120, 0x0820100201840008, 0x0201004120820004,
+        0x1080008040002080, 0x0101008030420200, 0x3021002000104100, 0x0000201001040900,
+        0xA018040080080180, 0x0002040080020080, 0x00483032484D0400, 0x0200040041208200,
+        0x0308104021088202, 0x8012441081002206, 0x81201100400A2001, 0x0030000408201101,
+        0x0042001004210882, 0x4402000801100482, 0x2004082201100084, 0x00127C0700E0C082,
+    ],
+)
+BISHOP_MAGICS = array(
+    "Q",
+    [
+        0x0040088200820010, 0x4002100D62008002, 0x0011110A02012220, 0x0084105200031842,
+        0x8244042205000004, 0x2002120220100502, 0x2104008808894821, 0x0828C20150280434,
+        0x01C0A002320A0420, 0x04011210021E8100, 0x0866108082104100, 0x2000040408840008,
+        0x0000011040800046, 0x6000010120100000, 0x800C00481210101B, 0x0E4800C40AC41000,
+        0x0015282808488800, 0x00080022100C0084, 0x0604100204041200, 0x0288002420441000,
+        0x2094008822081402, 0x0001400808082C00, 0x1802070B48222840, 0x000340802C060800,
+        0x00A0440212100A00, 0x03021004200400E0, 0x0002208830050040, 0x0004200824010004,
+        0x000604004200820A, 0x402104082A008404, 0x5188120200421288, 0x1840888082020082,
+        0x1108044000100200, 0x4014044404021004, 0x0000442082100101, 0x1104020080080080,
+        0x5422008400020020, 0x0001280A00002200, 0x0210040080824A22, 0x0002240100802080,
+        0x0001086011220448, 0x0404008804000880, 0x0202010048000100, 0x0010004010448200,
+        0x2609012124000A01, 0x004005080080130A, 0x8004082204018840, 0x4002208401000080,
+        0x0082080405040000, 0x000109008220000A, 0x0000104044108084, 0x140C400084040000,
+        0x0010880420820010, 0x2802208441620018, 0x404808A860840000, 0x1004012401061000,
+        0x2080150808023820, 0x0008050401010804, 0x2210000080844110, 0x040040000842020C,
+        0x104000402003440C, 0x8040002020223081, 0x4801111002080041, 0x80042802024C1101,
+    ],
+)
+# fmt: on
+
+
+def _sliding_attacks(square: int, occupied: int, directions) -> int:
+    """
+    Compute attacks of a sliding piece by walking the rays until the first blocker.
+
+    :param square: The square of the piece
+    :param occupied: The bitboard of occupied squares
+    :param directions: The (row, col) directions the piece slides in
+    :return: The bitboard of attacked squares, including the blockers
+    """
+    row, col = position_of(square)
+    attacks = 0
+    for d_row, d_col in directions:
+        target_row, target_col = row + d_row, col + d_col
+        while 0 <= target_row < BOARD_SIZE and 0 <= target_col < BOARD_SIZE:
+            bit = 1 << square_of((target_row, target_col))
+            attacks |= bit
+            if occupied & bit:
+                break
+            target_row, target_col = target_row + d_row, target_col + d_col
+    return attacks
+
+
+def _relevant_mask(square: int, directions) -> int:
+    """
+    Get the squares whose occupancy affects the attacks of a sliding piece,
+    the last square of every ray is excluded as it is attacked either way.
+
+    :param square: The square of the piece
+    :param directions: The (row, col) directions the piece slides in
+    :return: The occupancy mask bitboard
+    """
+    row, col = position_of(square)
+    mask = 0
+    for d_row, d_col in directions:
+        target_row, target_col = row + d_row, col + d_col
+        while (
+            0 <= target_row + d_row < BOARD_SIZE
+            and 0 <= target_col + d_col < BOARD_SIZE
+        ):
+            mask |= 1 << square_of((target_row, target_col))
+            target_row, target_col = target_row + d_row, target_col + d_col
+    return mask
+
+
+def _build_tables(magics: array, directions):
+    """
+    Build the occupancy masks, index shifts and attack tables for a sliding piece.
+
+    :param magics: The magic multipliers indexed by square
+    :param directions: The (row, col) directions the piece slides in
+    :return: A tuple of masks, shifts and attack tables indexed by square
+    :raises ValueError: If a magic maps blockers with different attacks to one slot
+    """
+    masks = array("Q", [0] * BOARD_SIZE**2)
+    shifts = array("B", [0] * BOARD_SIZE**2)
+    tables = []
+    for square in range(BOARD_SIZE**2):
+        mask = _relevant_mask(square, directions)
+        shift = 64 - mask.bit_count()
+        table = array("Q", [0] * (1 << mask.bit_count()))
+        # enumerate all subsets of the mask with the carry-rippler trick
+        occupied = 0
+        while True:
+            index = (occupied * magics[square] & BITBOARD_MASK) >> shift
+            attacks = _sliding_attacks(square, occupied, directions)
+            # a slider always attacks at least one square, so 0 marks an empty slot
+            if table[index] and table[index] != attacks:
+                raise ValueError(
+                    f"Magic {magics[square]:#x} of square {square} is invalid!"
+                )
+            table[index] = attacks
+            occupied = (occupied - mask) & mask
+            if not occupied:
+                break
+        masks[square] = mask
+        shifts[square] = shift
+        tables.append(table)
+    return masks, shifts, tables
+
+
+ROOK_MASKS, ROOK_SHIFTS, ROOK_ATTACKS = _build_tables(ROOK_MAGICS, ROOK_DIRECTIONS)
+BISHOP_MASKS, BISHOP_SHIFTS, BISHOP_ATTACKS = _build_tables(
+    BISHOP_MAGICS, BISHOP_DIRECTIONS
+)
+
+
+def rook_attacks(square: int, occupied: int = 0) -> int:
+    """
+    Get the squares attacked by a rook.
+
+    :param square: The square of the rook
+    :param occupied: The bitboard of occupied squares blocking the rook
+    :return: The bitboard of attacked squares, including the blockers
+    """
+    index = (
+        (occupied & ROOK_MASKS[square]) * ROOK_MAGICS[square] & BITBOARD_MASK
+    ) >> ROOK_SHIFTS[square]
+    return ROOK_ATTACKS[square][index]
+
+
+def bishop_attacks(square: int, occupied: int = 0) -> int:
+    """
+    Get the squares attacked by a bishop.
+
+    :param square: The square of the bishop
+    :param occupied: The bitboard of occupied squares blocking the bishop
+    :return: The bitboard of attacked squares, including the blockers
+    """
+    index = (
+        (occupied & BISHOP_MASKS[square]) * BISHOP_MAGICS[square] & BITBOARD_MASK
+    ) >> BISHOP_SHIFTS[square]
+    return BISHOP_ATTACKS[square][index]
+
+
+def queen_attacks(square: int, occupied: int = 0) -> int:
+    """
+    Get the squares attacked by a queen.
+
+    :param square: The square of the queen
+    :param occupied: The bitboard of occupied squares blocking the queen
+    :return: The bitboard of attacked squares, including the blockers
+    """
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
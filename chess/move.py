@@ -9,3 +9,23 @@ class Move:
         self.end_pos = end_pos
         self.piece = piece
         self.captured_piece = captured_piece
+
+
+class MoveUndo:
+    """Class holding the board state needed to take back a pushed move."""
+
+    def __init__(
+        self,
+        source,
+        target,
+        captured_type,
+        captured_color,
+        unmoved,
+        hash,
+    ):
+        self.source = source
+        self.target = target
+        self.captured_type = captured_type
+        self.captured_color = captured_color
+        self.unmoved = unmoved
+        self.hash = hash
@@ -1,27 +1,50 @@
-from abc import ABC, abstractmethod
-
-from .const import BOARD_SIZE, COLOR_WHITE
+from .attack_tables import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    PAWN_DIRECTIONS,
+    PAWN_DOUBLE_PUSHES,
+    PAWN_PUSHES,
+)
+from .bitboard import is_on_board, iter_bits, position_of, square_of
+from .const import BISHOP, KING, KNIGHT, PAWN, QUEEN, ROOK
 from .exception import InvalidMoveException
+from .magics import bishop_attacks, queen_attacks, rook_attacks
+
+# possible positions of a piece keyed by (class, color, position, has_moved)
+_POS_CACHE: dict[tuple, tuple[tuple[int, int], ...] | None] = {}
 
 
 class HasMovedMixin:
     """
-    Mixin class for adding has_move functionality.
+    Mixin class for adding has_move functionality,
+    the classes using it have to declare the _has_moved slot.
     """
 
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._has_moved = False
+
     @property
     def has_moved(self):
-        return getattr(self, "_has_moved", False)
+        return self._has_moved
 
     @has_moved.setter
     def has_moved(self, value: bool):
         self._has_moved = value
 
 
-class Piece(ABC):
+class Piece:
     """Base class for pieces."""
 
-    def __init__(self, position: tuple[int, int], color: str):
+    __slots__ = ("_color", "_position")
+
+    # piece type of the subclass, one of chess.const.PIECE_TYPES
+    PIECE_TYPE: int
+
+    def __init__(self, position: tuple[int, int], color: int):
         """
         Initializes a new instance of a Piece.
 
@@ -45,23 +68,36 @@ class Piece(ABC):
         """
         return self._color
 
-    def get_possible_positions(
-        self, board_size: int = BOARD_SIZE
-    ) -> list[tuple[int, int]] | None:
+    @property
+    def square(self):
+        """
+        Get the bitboard square index of the piece.
+        """
+        return square_of(self._position)
+
+    def get_possible_positions(self) -> tuple[tuple[int, int], ...] | None:
         """
         Get possible moves for the piece on the board. Does not consider the board rules.
 
-        :param board_size: The size of the board
-        :return: A list of tuples containing possible target positions
+        :return: A tuple of tuples containing possible target positions
         or None if there are no possible.
         """
-        positions = []
-        for row in range(board_size):
-            for col in range(board_size):
-                position = row, col
-                if self.can_move(target_position=position):
-                    positions.append(position)
-        return positions if len(positions) > 0 else None
+        key = (
+            type(self),
+            self._color,
+            self._position,
+            getattr(self, "_has_moved", False),
+        )
+        try:
+            return _POS_CACHE[key]
+        except KeyError:
+            pass
+        positions = tuple(
+            position_of(square) for square in iter_bits(self.get_targets())
+        )
+        positions = positions if len(positions) > 0 else None
+        _POS_CACHE[key] = positions
+        return positions
 
     def move(self, target_position: tuple[int, int]):
         """
@@ -77,7 +113,6 @@ class Piece(ABC):
                 f"Move of {self} from {self.position} to {target_position} is invalid!"
             )
 
-    @abstractmethod
     def can_move(self, target_position: tuple[int, int]) -> bool:
         """
         Check if the move is allowed, does not consider the board rules or other pieces.
@@ -85,6 +120,16 @@ class Piece(ABC):
         :param target_position: The target position to move the piece to.
         :return: True if move is valid and False otherwise
         """
+        if not is_on_board(target_position):
+            return False
+        return bool(self.get_targets() >> square_of(target_position) & 1)
+
+    def get_targets(self) -> int:
+        """
+        Get the bitboard of squares the piece can move to,
+        does not consider the board rules or other pieces.
+        """
+        raise NotImplementedError
 
 
 class Pawn(HasMovedMixin, Piece):
@@ -92,6 +137,15 @@ class Pawn(HasMovedMixin, Piece):
     Class representing a Pawn piece.
     """
 
+    __slots__ = ("_has_moved", "_forward")
+
+    PIECE_TYPE = PAWN
+
+    def __init__(self, position: tuple[int, int], color: int):
+        super().__init__(position, color)
+        # row direction the pawn moves in
+        self._forward = PAWN_DIRECTIONS[color]
+
     def __str__(self):
         return "Pawn"
 
@@ -100,16 +154,30 @@ class Pawn(HasMovedMixin, Piece):
         if not self.has_moved:
             self.has_moved = True
 
+    def pushes(self) -> int:
+        """
+        Get the bitboard of squares the pawn can be pushed to.
+        """
+        pushes = PAWN_PUSHES[self.color][self.square]
+        if not self.has_moved:
+            pushes |= PAWN_DOUBLE_PUSHES[self.color][self.square]
+        return pushes
+
+    def attacks(self) -> int:
+        """
+        Get the bitboard of squares attacked by the pawn.
+        """
+        return PAWN_ATTACKS[self.color][self.square]
+
+    def get_targets(self) -> int:
+        return self.pushes()
+
     def can_move(self, target_position: tuple[int, int]) -> bool:
-        dx = self.position[1] - target_position[1]
-        dy = (
-            self.position[0] - target_position[0]
-            if self.color == COLOR_WHITE
-            else target_position[0] - self.position[0]
-        )
-        if (dy == 1 and dx == 0) or (dy == 2 and dx == 0 and not self.has_moved):
-            return True
-        return False
+        if not is_on_board(target_position):
+            return False
+        d_row = (target_position[0] - self._position[0]) * self._forward
+        d_col = target_position[1] - self._position[1]
+        return d_col == 0 and (d_row == 1 or d_row == 2 and not self._has_moved)
 
 
 class King(HasMovedMixin, Piece):
@@ -117,6 +185,10 @@ class King(HasMovedMixin, Piece):
     Class representing a King piece.
     """
 
+    __slots__ = ("_has_moved",)
+
+    PIECE_TYPE = KING
+
     def __str__(self) -> str:
         return "King"
 
@@ -125,12 +197,14 @@ class King(HasMovedMixin, Piece):
         if not self.has_moved:
             self.has_moved = True
 
-    def can_move(self, target_position: tuple[int, int]) -> bool:
-        dx = abs(self.position[1] - target_position[1])
-        dy = abs(self.position[0] - target_position[0])
-        if dx == 1 and dy in (0, 1) or dy == 1 and dx in (0, 1):
-            return True
-        return False
+    def attacks(self) -> int:
+        """
+        Get the bitboard of squares attacked by the king.
+        """
+        return KING_ATTACKS[self.square]
+
+    def get_targets(self) -> int:
+        return self.attacks()
 
 
 class Queen(Piece):
@@ -138,15 +212,23 @@ class Queen(Piece):
     Class representing a Queen piece.
     """
 
+    __slots__ = ()
+
+    PIECE_TYPE = QUEEN
+
     def __str__(self) -> str:
         return "Queen"
 
-    def can_move(self, target_position: tuple[int, int]) -> bool:
-        dx = abs(self.position[1] - target_position[1])
-        dy = abs(self.position[0] - target_position[0])
-        if dx == dy != 0 or dx == 0 != dy or dx != 0 == dy:
-            return True
-        return False
+    def attacks(self, occupied: int = 0) -> int:
+        """
+        Get the bitboard of squares attacked by the queen.
+
+        :param occupied: The bitboard of occupied squares blocking the queen
+        """
+        return queen_attacks(self.square, occupied)
+
+    def get_targets(self) -> int:
+        return self.attacks()
 
 
 class Rook(HasMovedMixin, Piece):
@@ -154,6 +236,10 @@ class Rook(HasMovedMixin, Piece):
     Class representing a Rook piece.
     """
 
+    __slots__ = ("_has_moved",)
+
+    PIECE_TYPE = ROOK
+
     def __str__(self) -> str:
         return "Rook"
 
@@ -162,12 +248,16 @@ class Rook(HasMovedMixin, Piece):
         if not self.has_moved:
             self.has_moved = True
 
-    def can_move(self, target_position: tuple[int, int]) -> bool:
-        dx = abs(self.position[1] - target_position[1])
-        dy = abs(self.position[0] - target_position[0])
-        if dx == 0 != dy or dx != 0 == dy:
-            return True
-        return False
+    def attacks(self, occupied: int = 0) -> int:
+        """
+        Get the bitboard of squares attacked by the rook.
+
+        :param occupied: The bitboard of occupied squares blocking the rook
+        """
+        return rook_attacks(self.square, occupied)
+
+    def get_targets(self) -> int:
+        return self.attacks()
 
 
 class Knight(Piece):
@@ -175,15 +265,21 @@ class Knight(Piece):
     Class representing a Knight piece.
     """
 
+    __slots__ = ()
+
+    PIECE_TYPE = KNIGHT
+
     def __str__(self) -> str:
         return "Knight"
 
-    def can_move(self, target_position: tuple[int, int]) -> bool:
-        dx = abs(self.position[1] - target_position[1])
-        dy = abs(self.position[0] - target_position[0])
-        if dx == 1 and dy == 2:
-            return True
-        return False
+    def attacks(self) -> int:
+        """
+        Get the bitboard of squares attacked by the knight.
+        """
+        return KNIGHT_ATTACKS[self.square]
+
+    def get_targets(self) -> int:
+        return self.attacks()
 
 
 class Bishop(Piece):
@@ -191,12 +287,20 @@ class Bishop(Piece):
     Class representing a Bishop piece.
     """
 
+    __slots__ = ()
+
+    PIECE_TYPE = BISHOP
+
     def __str__(self) -> str:
         return "Bishop"
 
-    def can_move(self, target_position: tuple[int, int]) -> bool:
-        dx = abs(self.position[1] - target_position[1])
-        dy = abs(self.position[0] - target_position[0])
-        if dx == dy != 0:
-            return True
-        return False
+    def attacks(self, occupied: int = 0) -> int:
+        """
+        Get the bitboard of squares attacked by the bishop.
+
+        :param occupied: The bitboard of occupied squares blocking the bishop
+        """
+        return bishop_attacks(self.square, occupied)
+
+    def get_targets(self) -> int:
+        return self.attacks()
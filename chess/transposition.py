@@ -0,0 +1,104 @@
+import numpy as np
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+CLUSTER_SIZE = 3
+CACHE_LINE_SIZE = 64
+# 16 bytes per entry
+ENTRY_DTYPE = np.dtype(
+    [
+        ("key", np.uint64),
+        ("value", np.int32),
+        ("best_move", np.uint16),
+        ("depth", np.int8),
+        ("flag", np.uint8),
+    ]
+)
+# the entries of a cluster padded to a whole cache line
+CLUSTER_DTYPE = np.dtype(
+    [
+        ("entries", ENTRY_DTYPE, (CLUSTER_SIZE,)),
+        ("padding", np.uint8, (CACHE_LINE_SIZE - CLUSTER_SIZE * ENTRY_DTYPE.itemsize,)),
+    ]
+)
+# depth of an empty entry
+NO_DEPTH = -1
+# encoded best_move of an entry without a move, source and target can't be equal
+NO_MOVE = 0
+
+
+class TranspositionTable:
+    """
+    Class representing a fixed-size table of search results indexed by zobrist hashes.
+    """
+
+    def __init__(self, size: int = 1 << 16):
+        """
+        Initialize a transposition table.
+
+        :param size: The number of clusters, must be a power of two
+        :raises ValueError: If the size is not a power of two
+        """
+        if size <= 0 or size & (size - 1):
+            raise ValueError(f"Size of the table must be a power of two, got {size}!")
+        self._mask = size - 1
+        # over-allocate to start the clusters at a cache line boundary,
+        # so that probing a cluster touches a single cache line
+        buffer = np.zeros((size + 1) * CACHE_LINE_SIZE, dtype=np.uint8)
+        offset = -buffer.ctypes.data % CACHE_LINE_SIZE
+        clusters = buffer[offset : offset + size * CACHE_LINE_SIZE].view(CLUSTER_DTYPE)
+        self._table = clusters["entries"]
+        self.clear()
+
+    def clear(self):
+        """
+        Remove all entries from the table.
+        """
+        self._table.fill(0)
+        self._table["depth"] = NO_DEPTH
+
+    def probe(self, key: int):
+        """
+        Look up the entry stored for the position.
+
+        :param key: The zobrist hash of the position
+        :return: A tuple of (depth, flag, value, best_move) where best_move is
+        a (source, target) tuple of squares or None, or None if there is no entry.
+        """
+        # reading the fields of numpy scalars is slow, compare plain tuples instead
+        entries = self._table[key & self._mask].tolist()
+        for entry_key, value, best_move, depth, flag in entries:
+            if depth != NO_DEPTH and entry_key == key:
+                return (
+                    depth,
+                    flag,
+                    value,
+                    divmod(best_move, 64) if best_move != NO_MOVE else None,
+                )
+        return None
+
+    def store(self, key: int, depth: int, flag: int, value: int, best_move=None):
+        """
+        Store a search result of the position, replacing the entry of the same position,
+        an empty entry or the shallowest entry of the cluster in this order.
+
+        :param key: The zobrist hash of the position
+        :param depth: The depth the position was searched to
+        :param flag: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param value: The value of the position
+        :param best_move: The best move found as a (source, target) tuple of squares
+        """
+        index = key & self._mask
+        entries = self._table[index].tolist()
+        slot = None
+        for entry_slot, (entry_key, _, _, entry_depth, _) in enumerate(entries):
+            if entry_depth != NO_DEPTH and entry_key == key:
+                slot = entry_slot
+                break
+        if slot is None:
+            depths = [entry[3] for entry in entries]
+            slot = depths.index(min(depths))
+        source, target = best_move if best_move is not None else (0, 0)
+        self._table[index, slot] = (key, value, source * 64 + target, depth, flag)
@@ -0,0 +1,35 @@
+import random
+from array import array
+
+from .const import COLORS, PIECE_TYPES
+
+# fixed seed so that hashes are reproducible between runs
+_random = random.Random(0x5EED)
+
+# keys indexed by [color index * 6 + piece type][square]
+ZOBRIST = [
+    array("Q", [_random.getrandbits(64) for _ in range(64)])
+    for _ in range(len(COLORS) * len(PIECE_TYPES))
+]
+# toggled on every move, so that the same placement differs by side to move
+ZOBRIST_SIDE = _random.getrandbits(64)
+# keys indexed by the castling rights bit set
+ZOBRIST_CASTLE = array("Q", [_random.getrandbits(64) for _ in range(16)])
+
+# (king square, rook square) of every castling right, in the order of their bits
+CASTLING_SQUARES = ((60, 63), (60, 56), (4, 7), (4, 0))
+
+
+def castling_rights(unmoved: int) -> int:
+    """
+    Get the castling rights bit set of a position, a side keeps the right to castle
+    as long as neither its king nor the corresponding rook have moved.
+
+    :param unmoved: The bitboard of pieces which did not move yet
+    :return: The castling rights, a bit set indexing ZOBRIST_CASTLE
+    """
+    rights = 0
+    for bit, (king_square, rook_square) in enumerate(CASTLING_SQUARES):
+        if unmoved >> king_square & 1 and unmoved >> rook_square & 1:
+            rights |= 1 << bit
+    return rights
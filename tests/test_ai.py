@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from chess.ai import (
+    AI,
+    INFINITY,
+    MATE,
+    _value_from_table,
+    _value_to_table,
+)
+from chess.bitboard import iter_bits
+from chess.board import Board
+from chess.const import COLOR_WHITE, PIECE_TYPES
+
+
+def _minimax(board, color, depth, ply, ai):
+    """
+    Get the value of the board for the color to move by searching every move.
+    """
+    if depth == 0:
+        return ai.evaluate(board, color)
+    best_value = None
+    for piece_type in PIECE_TYPES:
+        for source in iter_bits(board.pieces[(piece_type, color)]):
+            for target in iter_bits(board._get_targets(piece_type, color, source)):
+                undo = board.push(source, target)
+                if not board.is_check(color):
+                    value = -_minimax(board, color ^ 1, depth - 1, ply + 1, ai)
+                    best_value = value if best_value is None else max(best_value, value)
+                board.pop(undo)
+    if best_value is None:
+        return -MATE + ply if board.is_check(color) else 0
+    return best_value
+
+
+def _random_position(rng, plies):
+    board, color = Board(), COLOR_WHITE
+    for _ in range(plies):
+        moves = [m for m in board.generate_moves(color) if board._is_safe(color, *m)]
+        if not moves:
+            break
+        board.push(*rng.choice(moves))
+        color ^= 1
+    return board, color
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_negamax_matches_minimax(seed):
+    board, color = _random_position(random.Random(seed), 10 + seed * 4)
+    ai = AI()
+    value = ai._negamax(board, color, 2, -INFINITY, INFINITY, 0)
+    assert value == _minimax(board, color, 2, 0, ai)
+
+
+def test_mate_values_are_stored_relative_to_the_node():
+    # mated 5 plies from the root, stored at ply 3 and probed at ply 1
+    stored = _value_to_table(-MATE + 5, 3)
+    assert stored == -MATE + 2
+    assert _value_from_table(stored, 1) == -MATE + 3
+    assert _value_from_table(_value_to_table(MATE - 7, 4), 2) == MATE - 5
+    assert _value_to_table(150, 9) == _value_from_table(150, 9) == 150
+
+
+def test_search_finds_mate_in_one():
+    board = Board()
+    for source, target in [
+        ((6, 4), (4, 4)),
+        ((1, 4), (3, 4)),
+        ((7, 5), (4, 2)),
+        ((0, 1), (2, 2)),
+        ((7, 3), (3, 7)),
+        ((0, 6), (2, 5)),
+    ]:
+        board.update(source, target)
+    # queen takes f7
+    assert AI(depth=2).search(board, COLOR_WHITE) == (31, 13)
@@ -0,0 +1,102 @@
+import copy
+import pickle
+
+import pytest
+
+import chess.board as board_module
+from chess.board import Board, _get_starting_state
+from chess.const import COLOR_BLACK, COLOR_WHITE
+from chess.exception import InvalidMoveException
+
+
+@pytest.mark.parametrize(
+    "piece_position, target_position",
+    [((7, 0), (7, 1)), ((7, 0), (7, 0)), ((4, 4), (3, 4))],
+)
+def test_update_rejects_invalid_moves(piece_position, target_position):
+    board = Board()
+    with pytest.raises(InvalidMoveException):
+        board.update(piece_position, target_position)
+    assert board.pieces == Board().pieces
+    assert board.hash == Board().hash
+
+
+def test_update_moves_the_piece():
+    board = Board()
+    board.update((6, 4), (4, 4))
+    assert board.get_occupied(COLOR_WHITE).bit_count() == 16
+    assert board.get_state(COLOR_WHITE, (6, 4))
+    assert not board.get_state(COLOR_WHITE, (4, 4))
+
+
+def test_possible_moves_follow_push_and_pop():
+    board = Board()
+    moves = board.get_possible_moves(COLOR_WHITE)
+    assert isinstance(moves, tuple)
+    assert len(moves) == 20
+    undo = board.push(52, 36)
+    assert len(board.get_possible_moves(COLOR_WHITE)) == 30
+    board.pop(undo)
+    assert board.get_possible_moves(COLOR_WHITE) == moves
+
+
+@pytest.mark.parametrize(
+    "piece_position, target_position",
+    [((6, 0), (4, 8)), ((6, 0), (-1, 0)), ((8, 0), (6, 0))],
+)
+def test_off_board_moves_are_invalid(piece_position, target_position):
+    board = Board()
+    assert not board.is_valid_move(piece_position, target_position)
+    with pytest.raises(InvalidMoveException):
+        board.update(piece_position, target_position)
+    assert board.pieces == Board().pieces
+
+
+def _pickle_round_trip(board):
+    return pickle.loads(pickle.dumps(board))
+
+
+def _rebuilt(board):
+    """
+    Get a board built from scratch out of the pieces of the given board.
+    """
+    return Board(
+        [[board._piece_at(row * 8 + col) for col in range(8)] for row in range(8)]
+    )
+
+
+@pytest.fixture(params=["python", "compiled"])
+def played_board(request, monkeypatch):
+    """
+    A board after a few moves, backed by the pure Python or the compiled kernel.
+    """
+    if request.param == "python":
+        monkeypatch.setattr(board_module, "_core", None)
+    elif board_module._core is None:
+        pytest.skip("the compiled kernel is not built")
+    board = Board(_get_starting_state())
+    board.update((6, 4), (4, 4))
+    board.update((1, 3), (3, 3))
+    return board
+
+
+@pytest.mark.parametrize("duplicate", [copy.deepcopy, _pickle_round_trip])
+def test_duplicated_board_is_independent(played_board, duplicate):
+    pieces, hash = dict(played_board.pieces), played_board.hash
+    mobility = [
+        played_board.get_mobility(color) for color in (COLOR_WHITE, COLOR_BLACK)
+    ]
+
+    board = duplicate(played_board)
+    assert board.pieces == pieces
+    assert board.hash == hash
+    board.update((4, 4), (3, 3))
+    for color in (COLOR_WHITE, COLOR_BLACK):
+        assert board.get_mobility(color) == _rebuilt(board).get_mobility(color)
+        assert board.is_check(color) == _rebuilt(board).is_check(color)
+
+    assert played_board.pieces == pieces
+    assert played_board.hash == hash
+    assert [
+        played_board.get_mobility(color) for color in (COLOR_WHITE, COLOR_BLACK)
+    ] == mobility
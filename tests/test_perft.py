@@ -0,0 +1,43 @@
+import pytest
+
+from chess.batch import perft
+from chess.board import Board
+from chess.const import COLOR_WHITE
+
+PERFT_NODES = {1: 20, 2: 400, 3: 8902}
+
+
+def _perft(board, color, depth):
+    """
+    Count the valid move sequences of the given depth with push and pop.
+    """
+    nodes = 0
+    for move in list(board.generate_moves(color)):
+        undo = board.push(*move)
+        if not board.is_check(color):
+            nodes += 1 if depth == 1 else _perft(board, color ^ 1, depth - 1)
+        board.pop(undo)
+    return nodes
+
+
+@pytest.mark.parametrize("depth, nodes", PERFT_NODES.items())
+def test_perft(depth, nodes):
+    board = Board()
+    assert _perft(board, COLOR_WHITE, depth) == nodes
+    assert board.hash == Board().hash
+
+
+@pytest.mark.parametrize("depth, nodes", PERFT_NODES.items())
+def test_batch_perft(depth, nodes):
+    assert perft(Board(), COLOR_WHITE, depth) == nodes
+
+
+@pytest.mark.parametrize("depth, nodes", PERFT_NODES.items())
+def test_kernel_perft(depth, nodes):
+    kernels = pytest.importorskip("chess._perft_kernels")
+    assert kernels.perft(Board(), COLOR_WHITE, depth) == nodes
+
+
+def test_perft_rejects_depth_below_one():
+    with pytest.raises(ValueError):
+        perft(Board(), COLOR_WHITE, 0)
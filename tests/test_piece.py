@@ -0,0 +1,28 @@
+import pytest
+
+from chess.const import COLOR_BLACK, COLOR_WHITE
+from chess.exception import InvalidMoveException
+from chess.piece import Bishop, King, Knight, Pawn, Queen, Rook
+
+
+@pytest.mark.parametrize(
+    "piece, target_position",
+    [
+        (Bishop((0, 0), COLOR_WHITE), (0, 9)),
+        (Knight((0, 0), COLOR_WHITE), (0, 10)),
+        (Rook((0, 0), COLOR_WHITE), (-1, 0)),
+        (Queen((7, 7), COLOR_BLACK), (8, 8)),
+        (King((0, 7), COLOR_BLACK), (1, 8)),
+        (Pawn((0, 0), COLOR_WHITE), (-1, 0)),
+    ],
+)
+def test_can_move_rejects_off_board_targets(piece, target_position):
+    assert piece.can_move(target_position) is False
+    with pytest.raises(InvalidMoveException):
+        piece.move(target_position)
+
+
+def test_can_move_accepts_on_board_targets():
+    assert Knight((0, 0), COLOR_WHITE).can_move((2, 1))
+    assert Rook((0, 0), COLOR_WHITE).can_move((7, 0))
+    assert Pawn((6, 0), COLOR_WHITE).can_move((4, 0))
@@ -0,0 +1,29 @@
+from chess.transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+
+def test_probe_returns_stored_entries():
+    table = TranspositionTable(16)
+    table.store(5, 3, EXACT, -7, (12, 28))
+    table.store(5 + 16, 2, LOWER_BOUND, 9)
+    assert table.probe(5) == (3, EXACT, -7, (12, 28))
+    assert table.probe(5 + 16) == (2, LOWER_BOUND, 9, None)
+    assert table.probe(6) is None
+
+
+def test_store_replaces_the_same_position_then_the_shallowest_entry():
+    table = TranspositionTable(16)
+    table.store(1, 4, EXACT, 1)
+    table.store(1, 2, UPPER_BOUND, 2)
+    assert table.probe(1) == (2, UPPER_BOUND, 2, None)
+    table.store(17, 5, EXACT, 3)
+    table.store(33, 6, EXACT, 4)
+    table.store(49, 7, EXACT, 5)
+    assert table.probe(1) is None
+    assert [table.probe(key)[2] for key in (17, 33, 49)] == [3, 4, 5]
+
+
+def test_clear_removes_all_entries():
+    table = TranspositionTable(16)
+    table.store(3, 1, EXACT, 0, (1, 2))
+    table.clear()
+    assert table.probe(3) is None
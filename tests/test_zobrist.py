@@ -0,0 +1,30 @@
+import random
+
+from chess.board import Board
+from chess.zobrist import ZOBRIST_SIDE
+
+
+def _rebuilt_hash(board, plies):
+    """
+    Get the hash of a board built from scratch out of the pieces of the given board.
+    """
+    state = [[board._piece_at(row * 8 + col) for col in range(8)] for row in range(8)]
+    return Board(state).hash ^ (ZOBRIST_SIDE if plies % 2 else 0)
+
+
+def test_incremental_hash_matches_rebuilt_hash():
+    rng = random.Random(7)
+    for _ in range(30):
+        board, color, undos = Board(), 0, []
+        for plies in range(1, 60):
+            moves = list(board.generate_moves(color))
+            if not moves:
+                break
+            undos.append((board.hash, board.push(*rng.choice(moves))))
+            color ^= 1
+            assert board.hash == _rebuilt_hash(board, plies)
+        while undos:
+            hash, undo = undos.pop()
+            board.pop(undo)
+            assert board.hash == hash
+        assert board.hash == Board().hash